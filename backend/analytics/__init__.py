@@ -0,0 +1,2 @@
+# Analytics module
+
@@ -0,0 +1,190 @@
+"""
+Cluster quality and stability metrics.
+
+Computed after every clustering run from the representation the clusterer
+already built, using sampling so the cost stays small next to the fit.
+Cluster ids of a new run are matched to the previous run's ids, which keeps
+ids (and therefore bubble chart colors) stable across reclusters.
+"""
+import re
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from backend.models.paper import Paper
+from backend.clustering.base_clustering import BaseClustering
+
+
+def sampled_silhouette(
+    features,
+    labels: np.ndarray,
+    sample_size: int = 1000,
+    random_state: int = 42
+) -> Optional[float]:
+    """
+    Compute the silhouette coefficient on a random sample of documents.
+
+    Returns:
+        Silhouette score, or None if it is undefined for the labels
+    """
+    from sklearn.metrics import silhouette_score
+
+    n_labels = len(np.unique(labels))
+    if features is None or n_labels < 2 or n_labels >= len(labels):
+        return None
+    sample = sample_size if sample_size < len(labels) else None
+    try:
+        return float(silhouette_score(
+            features, labels, metric='euclidean', sample_size=sample, random_state=random_state
+        ))
+    except ValueError:
+        # The sample can collapse to a single cluster on tiny corpora
+        return None
+
+
+def cluster_size_stats(labels: np.ndarray, n_clusters: int) -> dict:
+    """Summarise the distribution of cluster sizes."""
+    sizes = np.bincount(labels, minlength=n_clusters) if len(labels) else np.zeros(n_clusters, dtype=np.int64)
+    shares = sizes / max(sizes.sum(), 1)
+    nonzero = shares[shares > 0]
+    # Normalised entropy: 1.0 means perfectly balanced clusters
+    entropy = float(-(nonzero * np.log(nonzero)).sum() / np.log(n_clusters)) if n_clusters > 1 else 1.0
+    return {
+        'sizes': sizes.tolist(),
+        'min': int(sizes.min()) if n_clusters else 0,
+        'max': int(sizes.max()) if n_clusters else 0,
+        'mean': float(sizes.mean()) if n_clusters else 0.0,
+        'std': round(float(sizes.std()), 4) if n_clusters else 0.0,
+        'empty': int((sizes == 0).sum()),
+        'balance': round(entropy, 4),
+    }
+
+
+def match_cluster_ids(old_labels: np.ndarray, new_labels: np.ndarray) -> Dict[int, int]:
+    """
+    Find the relabelling of new cluster ids that best matches the old ids.
+
+    Solves the assignment problem on the contingency matrix so that the
+    number of papers keeping their cluster id is maximised. New clusters
+    without a counterpart get the smallest unused ids.
+
+    Returns:
+        Mapping from new cluster id to matched id
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    new_ids = np.unique(new_labels)
+    if len(old_labels) == 0:
+        return {int(new_id): int(new_id) for new_id in new_ids}
+
+    size = int(max(old_labels.max(), new_labels.max())) + 1
+    contingency = np.zeros((size, size), dtype=np.int64)
+    np.add.at(contingency, (new_labels, old_labels), 1)
+    rows, cols = linear_sum_assignment(contingency, maximize=True)
+    assignment = dict(zip(rows.tolist(), cols.tolist()))
+    return {int(new_id): int(assignment[new_id]) for new_id in new_ids}
+
+
+def _renumber_name(name: str, cluster_id: int) -> str:
+    """Replace the number in a "Cluster 3: ..." style name with a new id."""
+    return re.sub(r'^(\w+) \d+:', lambda m: f"{m.group(1)} {cluster_id + 1}:", name, count=1)
+
+
+def align_clusters(
+    papers: List[Paper],
+    clusters: List[dict],
+    previous: Dict[str, int]
+) -> Optional[float]:
+    """
+    Relabel a clustering in place so its ids match the previous run.
+
+    Ids stay consecutive from 0, and the number in each cluster name is
+    rewritten to match its new id.
+
+    Args:
+        papers: Papers with new cluster assignments
+        clusters: Cluster metadata of the new run
+        previous: Previous cluster id per paper id
+
+    Returns:
+        Adjusted Rand index between the runs, or None without a previous run
+    """
+    from sklearn.metrics import adjusted_rand_score
+
+    shared = [p for p in papers if p.cluster_id is not None and previous.get(p.id) is not None]
+    if not shared:
+        return None
+
+    old_labels = np.array([previous[p.id] for p in shared], dtype=np.int64)
+    new_labels = np.array([p.cluster_id for p in shared], dtype=np.int64)
+    matched = match_cluster_ids(old_labels, new_labels)
+
+    # Keep matched ids that fit in 0..k-1; clusters matched to an id beyond
+    # that (the run has fewer clusters) or to nothing fill the gaps in order
+    n_clusters = len(clusters)
+    mapping = {new_id: old_id for new_id, old_id in matched.items() if old_id < n_clusters}
+    used = set(mapping.values())
+    spare = (i for i in range(n_clusters) if i not in used)
+    for cluster in clusters:
+        if cluster['id'] not in mapping:
+            mapping[cluster['id']] = next(spare)
+
+    for cluster in clusters:
+        cluster['id'] = mapping[cluster['id']]
+        cluster['name'] = _renumber_name(cluster['name'], cluster['id'])
+    clusters.sort(key=lambda cluster: cluster['id'])
+    names = {cluster['id']: cluster['name'] for cluster in clusters}
+    for paper in papers:
+        if paper.cluster_id is not None:
+            paper.cluster_id = mapping[paper.cluster_id]
+            paper.cluster_name = names[paper.cluster_id]
+
+    return float(adjusted_rand_score(old_labels, new_labels))
+
+
+def build_quality_report(
+    clusterer: BaseClustering,
+    papers: List[Paper],
+    clusters: List[dict],
+    adjusted_rand_index: Optional[float] = None,
+    sample_size: int = 1000
+) -> dict:
+    """
+    Compute quality metrics for a finished clustering run.
+
+    Args:
+        clusterer: Clusterer that produced the run
+        papers: Clustered papers, in the order the clusterer received them
+        clusters: Cluster metadata
+        adjusted_rand_index: Agreement with the previous run, if any
+        sample_size: Number of documents sampled for the silhouette
+    """
+    start = time.perf_counter()
+
+    # Ids may have been remapped, so use positions for the label arrays
+    positions = {cluster['id']: idx for idx, cluster in enumerate(clusters)}
+    labels = np.array([positions.get(p.cluster_id, -1) for p in papers], dtype=np.int64)
+    assigned = labels >= 0
+    features = clusterer.get_features()
+    if features is not None and not assigned.all():
+        features = features[np.flatnonzero(assigned)]
+    labels = labels[assigned]
+
+    coherence = None
+    if hasattr(clusterer, 'get_coherence'):
+        coherence = float(clusterer.get_coherence())
+
+    sizes = cluster_size_stats(labels, len(clusters))
+    sizes['by_cluster'] = {cluster['id']: count for cluster, count in zip(clusters, sizes.pop('sizes'))}
+
+    silhouette = sampled_silhouette(features, labels, sample_size=sample_size)
+    return {
+        'method_name': clusterer.get_method_name(),
+        'n_clusters': len(clusters),
+        'n_papers': int(assigned.sum()),
+        'silhouette': None if silhouette is None else round(silhouette, 4),
+        'silhouette_sample_size': int(min(sample_size, len(labels))),
+        'cluster_sizes': sizes,
+        'coherence': None if coherence is None else round(coherence, 4),
+        'adjusted_rand_index': None if adjusted_rand_index is None else round(adjusted_rand_index, 4),
+        'compute_ms': round((time.perf_counter() - start) * 1000, 2),
+    }
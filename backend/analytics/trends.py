@@ -0,0 +1,163 @@
+"""
+Temporal topic-trend analysis.
+
+After each clustering run the corpus is aggregated into dense
+year x cluster x venue cubes of paper counts and citation sums. Trend
+queries are answered by slicing and summing these cubes, so their cost
+depends on the cube size rather than the number of papers.
+"""
+from typing import Dict, List, Optional
+import numpy as np
+from backend.models.paper import Paper
+
+
+class TrendCube:
+    """Year x cluster x venue aggregates of a clustered corpus."""
+
+    def __init__(
+        self,
+        papers: List[Paper],
+        clusters: List[dict],
+        window: int = 2,
+        emerging_threshold: float = 0.25,
+        min_recent_papers: int = 3
+    ):
+        """
+        Build the trend cubes.
+
+        Args:
+            papers: Clustered papers
+            clusters: Cluster metadata from the clustering run
+            window: Number of years compared when computing growth rates
+            emerging_threshold: Minimum share growth for a cluster to be
+                flagged as emerging
+            min_recent_papers: Minimum papers in the recent window for a
+                cluster to be flagged as emerging
+        """
+        self.window = window
+        self.emerging_threshold = emerging_threshold
+        self.min_recent_papers = min_recent_papers
+
+        self.cluster_ids = [cluster['id'] for cluster in clusters]
+        self.cluster_names = {cluster['id']: cluster['name'] for cluster in clusters}
+        cluster_index = {cluster_id: idx for idx, cluster_id in enumerate(self.cluster_ids)}
+
+        clustered = [p for p in papers if p.cluster_id in cluster_index]
+        if clustered:
+            first_year = min(p.year for p in clustered)
+            last_year = max(p.year for p in clustered)
+        else:
+            first_year = last_year = 0
+        self.years = list(range(first_year, last_year + 1)) if clustered else []
+        self.venues = sorted({p.venue for p in clustered})
+        venue_index = {venue: idx for idx, venue in enumerate(self.venues)}
+
+        shape = (len(self.years), len(self.cluster_ids), len(self.venues))
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.citations = np.zeros(shape, dtype=np.int64)
+        if clustered:
+            year_idx = np.array([p.year - first_year for p in clustered], dtype=np.int64)
+            cluster_idx = np.array([cluster_index[p.cluster_id] for p in clustered], dtype=np.int64)
+            venue_idx = np.array([venue_index[p.venue] for p in clustered], dtype=np.int64)
+            np.add.at(self.counts, (year_idx, cluster_idx, venue_idx), 1)
+            np.add.at(
+                self.citations,
+                (year_idx, cluster_idx, venue_idx),
+                np.array([p.citations for p in clustered], dtype=np.int64)
+            )
+
+        # Trends over the full cube are what dashboards poll by default
+        self._default = self._build_response(slice(None), list(range(len(self.cluster_ids))), None)
+
+    def _growth(self, counts: np.ndarray):
+        """
+        Compare each cluster's share of papers in the most recent window
+        with its share in the preceding window.
+
+        Args:
+            counts: Year x cluster paper counts
+
+        Returns:
+            Tuple of (growth rates, emerging flags), one entry per cluster
+        """
+        recent = counts[-self.window:].sum(axis=0)
+        prior = counts[-2 * self.window:-self.window].sum(axis=0)
+
+        recent_share = recent / max(recent.sum(), 1)
+        prior_share = prior / max(prior.sum(), 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = np.where(prior_share > 0, (recent_share - prior_share) / prior_share, np.nan)
+        # Without a preceding window there is nothing to compare against
+        emerging = (
+            (prior.sum() > 0)
+            & (recent >= self.min_recent_papers)
+            & ((prior == 0) | (growth >= self.emerging_threshold))
+        )
+        return growth, emerging
+
+    def _build_response(self, year_slice: slice, cluster_positions: List[int], venue_position: Optional[int]) -> dict:
+        """Slice the cubes and derive per-cluster trend series."""
+        venue_slice = slice(None) if venue_position is None else slice(venue_position, venue_position + 1)
+        # Keep every cluster for growth, since shares are relative to all of them
+        all_counts = self.counts[year_slice][:, :, venue_slice].sum(axis=2)
+        counts = all_counts[:, cluster_positions]
+        citations = self.citations[year_slice][:, cluster_positions, venue_slice].sum(axis=2)
+        years = self.years[year_slice]
+
+        if len(years):
+            growth, emerging = self._growth(all_counts)
+            growth, emerging = growth[cluster_positions], emerging[cluster_positions]
+        else:
+            growth = np.full(len(cluster_positions), np.nan)
+            emerging = np.zeros(len(cluster_positions), dtype=bool)
+
+        clusters = []
+        for column, position in enumerate(cluster_positions):
+            cluster_id = self.cluster_ids[position]
+            clusters.append({
+                'id': cluster_id,
+                'name': self.cluster_names[cluster_id],
+                'counts': counts[:, column].tolist(),
+                'citations': citations[:, column].tolist(),
+                'growth_rate': None if np.isnan(growth[column]) else round(float(growth[column]), 4),
+                'emerging': bool(emerging[column]),
+            })
+        return {
+            'years': years,
+            'window': self.window,
+            'clusters': clusters,
+        }
+
+    def query(
+        self,
+        cluster_id: Optional[int] = None,
+        venue: Optional[str] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None
+    ) -> Dict:
+        """
+        Get trend series for a slice of the cube.
+
+        Raises:
+            KeyError: If the cluster or venue is unknown
+        """
+        if cluster_id is None and venue is None and start_year is None and end_year is None:
+            return self._default
+
+        if cluster_id is None:
+            cluster_positions = list(range(len(self.cluster_ids)))
+        elif cluster_id in self.cluster_names:
+            cluster_positions = [self.cluster_ids.index(cluster_id)]
+        else:
+            raise KeyError(f"Unknown cluster: {cluster_id}")
+
+        venue_position = None
+        if venue is not None:
+            if venue not in self.venues:
+                raise KeyError(f"Unknown venue: {venue}")
+            venue_position = self.venues.index(venue)
+
+        first_year = self.years[0] if self.years else 0
+        start = 0 if start_year is None else max(start_year - first_year, 0)
+        end = len(self.years) if end_year is None else max(end_year - first_year + 1, 0)
+        return self._build_response(slice(start, end), cluster_positions, venue_position)
@@ -0,0 +1,80 @@
+"""
+Server-side event-loop lag monitor.
+
+A background task sleeps for a fixed interval and records how late it woke
+up. The overshoot is time the loop spent unable to run callbacks, measured
+inside the server, so it excludes network and request queueing. Samples are
+tagged with whether a recluster was in flight, so its cost can be told
+apart from ordinary request load.
+"""
+import asyncio
+from collections import deque
+from typing import Callable, List, Optional
+
+
+def summarize_lag(lags: List[float]) -> dict:
+    """Summarise lag samples in milliseconds."""
+    if not lags:
+        return {'count': 0}
+    ordered = sorted(lags)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        'count': len(ordered),
+        'mean': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50': round(pick(0.50) * 1000, 3),
+        'p95': round(pick(0.95) * 1000, 3),
+        'p99': round(pick(0.99) * 1000, 3),
+        'max': round(ordered[-1] * 1000, 3),
+    }
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag as the overshoot of a periodic asyncio.sleep."""
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        max_samples: int = 60000,
+        busy: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Args:
+            interval: Seconds between samples
+            max_samples: Samples kept, oldest first to go
+            busy: Returns whether a recluster is in flight
+        """
+        self.interval = interval
+        self.busy = busy or (lambda: False)
+        # (loop time, lag in seconds, recluster in flight)
+        self.samples = deque(maxlen=max_samples)
+
+    async def run(self):
+        """Record lag samples until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            busy = self.busy()
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            self.samples.append((now, max(0.0, now - start - self.interval), busy or self.busy()))
+
+    def summary(self, since: Optional[float] = None) -> dict:
+        """
+        Summarise samples taken after `since`, a loop time from an earlier summary.
+
+        Returns:
+            The current loop time plus lag percentiles for all samples, and
+            split by whether a recluster was in flight
+        """
+        now = asyncio.get_running_loop().time()
+        window = [s for s in self.samples if since is None or s[0] > since]
+        return {
+            'now': now,
+            'interval_ms': self.interval * 1000,
+            'all': summarize_lag([lag for _, lag, _ in window]),
+            'during_recluster': summarize_lag([lag for _, lag, busy in window if busy]),
+            'other': summarize_lag([lag for _, lag, busy in window if not busy]),
+        }
@@ -2,10 +2,13 @@
 FastAPI backend for Digital Library Visualization.
 """
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from typing import Dict, List, Optional
+from dataclasses import replace
 from pydantic import BaseModel
+import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -13,10 +16,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.models.paper import Paper
-from backend.data.data_loader import load_papers
-from backend.clustering.lda_clustering import LDAClustering
-from backend.clustering.kmeans_clustering import KMeansClustering
-from backend.clustering.hierarchical_clustering import HierarchicalClustering
+from backend.data.data_loader import load_papers, load_cluster_state, save_cluster_state
+from backend.data.exporter import (
+    check_export_support, export_filename, export_media_type, stream_export, take_snapshot
+)
+from backend.clustering.registry import CLUSTERING_METHODS, get_clusterer
+from backend.search.ranker import PaperRanker
+from backend.graph.coauthor_graph import CoauthorGraph
+from backend.analytics.trends import TrendCube
+from backend.analytics.quality import align_clusters, build_quality_report
+from backend.api.loop_monitor import LoopLagMonitor
 
 app = FastAPI(title="Digital Library Visualization API", version="1.0.0")
 
@@ -33,6 +42,17 @@ app.add_middleware(
 papers: List[Paper] = []
 clusters: List[dict] = []
 current_method: str = "kmeans"
+ranker: Optional[PaperRanker] = None
+coauthor_graph: CoauthorGraph = CoauthorGraph()
+trend_cube: Optional[TrendCube] = None
+quality_report: Optional[dict] = None
+# Readiness: "indexing" -> "clustering" -> "ready" (or "failed")
+status: Dict[str, Optional[str]] = {"state": "starting", "error": None}
+recluster_lock = asyncio.Lock()
+background_tasks = set()
+# Where the last clustering is persisted; an empty value disables persistence
+CLUSTER_STATE_PATH = os.environ.get("CLUSTER_STATE_PATH", "data/cluster_state.json")
+loop_monitor = LoopLagMonitor(busy=recluster_lock.locked)
 
 
 # Pydantic models for API responses
@@ -61,28 +81,110 @@ class ClusterResponse(BaseModel):
 
 @app.on_event("startup")
 async def startup_event():
-    """Load papers and perform initial clustering on startup."""
-    global papers, clusters, current_method
+    """Load papers and schedule indexing and initial clustering in the background."""
+    global papers, clusters, current_method, quality_report
     papers = load_papers()
-    # Perform initial clustering
-    await recluster_papers("kmeans")
+    
+    # Serve the last persisted clustering, if it covers every paper
+    state = load_cluster_state(CLUSTER_STATE_PATH) if CLUSTER_STATE_PATH else None
+    needs_clustering = True
+    if state:
+        assignments = state.get("assignments", {})
+        if all(p.id in assignments for p in papers):
+            apply_clustering(assignments, state["clusters"])
+            current_method = state["method"]
+            quality_report = state.get("quality")
+            needs_clustering = False
+    
+    for coroutine in (initialize(needs_clustering), loop_monitor.run()):
+        task = asyncio.create_task(coroutine)
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
 
 
-async def recluster_papers(method: str, n_clusters: int = 5):
-    """Re-cluster papers using the specified method."""
-    global papers, clusters, current_method
-    
-    if method == "lda":
-        clusterer = LDAClustering()
-    elif method == "kmeans":
-        clusterer = KMeansClustering()
-    elif method == "hierarchical":
-        clusterer = HierarchicalClustering()
-    else:
+async def initialize(needs_clustering: bool):
+    """Build search and author indexes, then run the first clustering if needed."""
+    global ranker, coauthor_graph, trend_cube
+    try:
+        status["state"] = "indexing"
+        ranker, coauthor_graph = await asyncio.to_thread(
+            lambda: (PaperRanker(papers), CoauthorGraph(papers))
+        )
+        if needs_clustering:
+            status["state"] = "clustering"
+            # Skipped if a recluster requested during indexing already ran
+            await recluster_papers(current_method, only_if_unclustered=True)
+        else:
+            async with recluster_lock:
+                if trend_cube is None:
+                    trend_cube = await asyncio.to_thread(TrendCube, papers, clusters)
+        status["state"] = "ready"
+    except Exception as e:
+        status["state"] = "failed"
+        status["error"] = str(e)
+
+
+def apply_clustering(assignments: Dict[str, int], new_clusters: List[dict]):
+    """Write a clustering result onto the shared papers in one synchronous pass."""
+    global clusters
+    names = {cluster["id"]: cluster["name"] for cluster in new_clusters}
+    for paper in papers:
+        paper.cluster_id = assignments.get(paper.id)
+        paper.cluster_name = names.get(paper.cluster_id)
+    clusters = new_clusters
+
+
+def run_clustering(method: str, n_clusters: int, snapshot: List[Paper]):
+    """Cluster a snapshot of the papers; runs in a worker thread."""
+    previous = {p.id: p.cluster_id for p in snapshot if p.cluster_id is not None}
+    clusterer = get_clusterer(method)
+    clustered, new_clusters = clusterer.cluster(snapshot, n_clusters=n_clusters)
+    # Keep cluster ids (and chart colors) stable relative to the previous run
+    adjusted_rand_index = align_clusters(clustered, new_clusters, previous)
+    report = build_quality_report(clusterer, clustered, new_clusters, adjusted_rand_index)
+    cube = TrendCube(clustered, new_clusters)
+    assignments = {p.id: p.cluster_id for p in clustered}
+    return assignments, new_clusters, report, cube
+
+
+async def recluster_papers(method: str, n_clusters: int = 5, only_if_unclustered: bool = False):
+    """
+    Re-cluster papers using the specified method.
+
+    With only_if_unclustered, nothing happens if a clustering is already
+    in place once the lock is acquired.
+    """
+    global current_method, trend_cube, quality_report
+    
+    if method not in CLUSTERING_METHODS:
         raise ValueError(f"Unknown clustering method: {method}")
     
-    papers, clusters = clusterer.cluster(papers, n_clusters=n_clusters)
-    current_method = method
+    async with recluster_lock:
+        if only_if_unclustered and clusters:
+            return
+        # Cluster copies off the event loop so reads keep serving the old state
+        snapshot = [replace(p) for p in papers]
+        assignments, new_clusters, report, cube = await asyncio.to_thread(
+            run_clustering, method, n_clusters, snapshot
+        )
+        apply_clustering(assignments, new_clusters)
+        current_method = method
+        quality_report = report
+        trend_cube = cube
+        coauthor_graph.refresh_clusters()
+        # Once indexes exist, any successful run (including one after a
+        # failed startup clustering) leaves the API ready
+        if ranker is not None:
+            status["state"] = "ready"
+            status["error"] = None
+        if CLUSTER_STATE_PATH:
+            save_cluster_state({
+                "method": method,
+                "n_clusters": n_clusters,
+                "clusters": new_clusters,
+                "assignments": assignments,
+                "quality": report,
+            }, CLUSTER_STATE_PATH)
 
 
 @app.get("/", include_in_schema=False)
@@ -91,6 +193,35 @@ async def root():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/api/health")
+async def health():
+    """Liveness check; succeeds as soon as the server accepts requests."""
+    return {"status": "ok"}
+
+
+@app.get("/api/health/loop-lag")
+async def loop_lag(
+    since: Optional[float] = Query(None, description="Only include samples after this loop time")
+):
+    """Get event-loop lag measured inside the server, split by whether a recluster was in flight."""
+    return loop_monitor.summary(since)
+
+
+@app.get("/api/ready")
+async def ready():
+    """Report whether indexes are built and papers have been clustered."""
+    body = {
+        "ready": status["state"] == "ready",
+        "state": status["state"],
+        "method": current_method,
+        "clustered": bool(clusters),
+        "error": status["error"],
+    }
+    if not body["ready"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
 @app.get("/api/info")
 async def api_info():
     """API metadata and available endpoints."""
@@ -99,11 +230,22 @@ async def api_info():
         "version": "1.0.0",
         "docs": "http://localhost:8000/docs",
         "endpoints": {
+            "/api/health": "Liveness check",
+            "/api/health/loop-lag": "Event-loop lag measured inside the server",
+            "/api/ready": "Readiness: whether indexing and initial clustering are done",
             "/api/papers": "Get all papers",
             "/api/clusters": "Get cluster information",
+            "/api/clusters/quality": "Get quality metrics of the last clustering run",
             "/api/cluster/{method}": "Re-cluster papers",
+            "/api/export": "Stream the clustered corpus as NDJSON, CSV, Arrow or Parquet",
             "/api/search": "Search papers",
             "/api/stats": "Get dataset statistics",
+            "/api/trends": "Get per-cluster publication trends by year",
+            "/api/authors": "List authors",
+            "/api/authors/components": "Get co-authorship connected components",
+            "/api/authors/{author_id}": "Get an author profile",
+            "/api/authors/{author_id}/collaborators": "Get an author's collaborators",
+            "/api/authors/{author_id}/clusters": "Get an author's papers per cluster",
         },
     }
 
@@ -147,13 +289,23 @@ async def get_clusters():
     return clusters
 
 
+@app.get("/api/clusters/quality")
+async def get_cluster_quality():
+    """Get quality and stability metrics of the last clustering run."""
+    global quality_report
+    
+    if quality_report is None:
+        raise HTTPException(status_code=503, detail="No clustering run has completed yet")
+    return {"method": current_method, **quality_report}
+
+
 @app.post("/api/cluster/{method}")
 async def cluster_papers(
     method: str,
     n_clusters: int = Query(5, ge=2, le=20, description="Number of clusters")
 ):
     """Re-cluster papers using the specified method."""
-    valid_methods = ["lda", "kmeans", "hierarchical"]
+    valid_methods = list(CLUSTERING_METHODS)
     if method not in valid_methods:
         raise HTTPException(
             status_code=400,
@@ -172,41 +324,60 @@ async def cluster_papers(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/export")
+async def export_papers(
+    fmt: str = Query("ndjson", alias="format", description="One of: ndjson, csv, arrow, parquet"),
+    compression: str = Query("none", description="One of: none, gzip, zstd"),
+    chunk_size: int = Query(1000, ge=1, le=100000, description="Papers per streamed chunk")
+):
+    """Stream all papers with their cluster assignments and cluster metadata."""
+    global papers, clusters
+    
+    try:
+        check_export_support(fmt, compression)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=f"Export format requires {e.name}")
+    
+    # Encoding runs in a worker thread, so pin the current state first
+    snapshot = take_snapshot(papers)
+    chunks = stream_export(snapshot, list(clusters), fmt, compression, chunk_size)
+    return StreamingResponse(
+        chunks,
+        media_type=export_media_type(fmt, compression),
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(fmt, compression)}"'
+        }
+    )
+
+
+def require_indexes():
+    """Reject requests that need the search and author indexes before they are built."""
+    if ranker is None:
+        raise HTTPException(status_code=503, detail="Search and author indexes are still being built")
+
+
 @app.get("/api/search")
 async def search_papers(
     q: str = Query(..., description="Search query"),
-    limit: int = Query(50, ge=1, le=200, description="Maximum number of results")
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of results"),
+    w_text: Optional[float] = Query(None, ge=0, description="Weight of text relevance"),
+    w_citations: Optional[float] = Query(None, ge=0, description="Weight of the citation prior"),
+    w_recency: Optional[float] = Query(None, ge=0, description="Weight of the recency prior")
 ):
-    """Search papers by keyword."""
-    global papers
+    """Search papers, ranked by text relevance, citations and recency."""
+    require_indexes()
     
-    query_lower = q.lower()
-    results = []
+    # Unset weights fall back to the ranker's defaults
+    weights = {"text": w_text, "citations": w_citations, "recency": w_recency}
+    weights = {name: value for name, value in weights.items() if value is not None}
+    results, total = ranker.search(q, limit=limit, weights=weights)
     
-    for paper in papers:
-        score = 0
-        # Title match (highest weight)
-        if query_lower in paper.title.lower():
-            score += 10
-        # Keyword match
-        for keyword in paper.keywords:
-            if query_lower in keyword.lower():
-                score += 5
-        # Abstract match
-        if query_lower in paper.abstract.lower():
-            score += 2
-        
-        if score > 0:
-            results.append((paper, score))
-    
-    # Sort by score (descending)
-    results.sort(key=lambda x: x[1], reverse=True)
-    
-    # Return top results
     return {
         "query": q,
-        "results": [paper.to_dict() for paper, _ in results[:limit]],
-        "total": len(results)
+        "results": [{**paper.to_dict(), "score": round(score, 4)} for paper, score in results],
+        "total": total
     }
 
 
@@ -238,6 +409,89 @@ async def get_stats():
     }
 
 
+@app.get("/api/trends")
+async def get_trends(
+    cluster_id: Optional[int] = Query(None, description="Filter by cluster ID"),
+    venue: Optional[str] = Query(None, description="Filter by venue"),
+    start_year: Optional[int] = Query(None, description="First year to include"),
+    end_year: Optional[int] = Query(None, description="Last year to include")
+):
+    """Get per-cluster paper counts, citation sums and growth by year."""
+    global trend_cube
+    
+    if trend_cube is None:
+        raise HTTPException(status_code=503, detail="Trends are not available until papers are clustered")
+    
+    try:
+        trends = trend_cube.query(
+            cluster_id=cluster_id,
+            venue=venue,
+            start_year=start_year,
+            end_year=end_year
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    
+    return {"method": current_method, **trends}
+
+
+def get_author_or_404(author_id: int) -> int:
+    """Validate that an author id exists in the co-authorship graph."""
+    require_indexes()
+    if not coauthor_graph.has_author(author_id):
+        raise HTTPException(status_code=404, detail=f"Author {author_id} not found")
+    return author_id
+
+
+@app.get("/api/authors")
+async def get_authors(
+    q: Optional[str] = Query(None, description="Filter by author name word prefixes"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of authors")
+):
+    """List authors ordered by number of papers."""
+    require_indexes()
+    return coauthor_graph.authors(query=q, limit=limit)
+
+
+@app.get("/api/authors/components")
+async def get_author_components(
+    limit: int = Query(20, ge=1, le=500, description="Maximum number of components"),
+    member_limit: int = Query(20, ge=0, le=500, description="Maximum author names per component")
+):
+    """Get connected components of the co-authorship graph, largest first."""
+    require_indexes()
+    return {
+        "total": coauthor_graph.num_components,
+        "components": coauthor_graph.components(limit=limit, member_limit=member_limit)
+    }
+
+
+@app.get("/api/authors/{author_id}")
+async def get_author(author_id: int):
+    """Get an author profile."""
+    return coauthor_graph.profile(get_author_or_404(author_id))
+
+
+@app.get("/api/authors/{author_id}/collaborators")
+async def get_author_collaborators(
+    author_id: int,
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of collaborators")
+):
+    """Get an author's collaborators ordered by number of shared papers."""
+    return coauthor_graph.collaborators(get_author_or_404(author_id), limit=limit)
+
+
+@app.get("/api/authors/{author_id}/clusters")
+async def get_author_clusters(author_id: int):
+    """Get the distribution of an author's papers over the current clusters."""
+    distribution = coauthor_graph.cluster_distribution(get_author_or_404(author_id))
+    names = {cluster['id']: cluster['name'] for cluster in clusters}
+    return [
+        {"cluster_id": cluster_id, "cluster_name": names.get(cluster_id), "count": count}
+        for cluster_id, count in distribution.items()
+    ]
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
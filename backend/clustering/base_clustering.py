@@ -9,6 +9,9 @@ from backend.models.paper import Paper
 class BaseClustering(ABC):
     """Abstract base class for clustering algorithms."""
     
+    # Document representation used by the last clustering run
+    features = None
+    
     @abstractmethod
     def cluster(self, papers: List[Paper], n_clusters: int = 5) -> Tuple[List[Paper], List[dict]]:
         """
@@ -27,4 +30,8 @@ class BaseClustering(ABC):
     def get_method_name(self) -> str:
         """Get the name of the clustering method."""
         pass
+    
+    def get_features(self):
+        """Get the document vectors of the last run, one row per paper, if available."""
+        return self.features
 
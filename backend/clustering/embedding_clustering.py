@@ -0,0 +1,89 @@
+"""
+Embedding-based clustering implementation using dense document vectors.
+"""
+from typing import List, Optional, Tuple
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.cluster import KMeans
+import numpy as np
+from backend.models.paper import Paper
+from backend.clustering.base_clustering import BaseClustering
+from backend.embeddings.cache import EmbeddingCache
+from backend.embeddings.encoders import BaseEncoder, encoder_from_env
+
+
+class EmbeddingClustering(BaseClustering):
+    """K-means clustering for papers on cached dense embeddings."""
+
+    def __init__(
+        self,
+        encoder: Optional[BaseEncoder] = None,
+        cache: Optional[EmbeddingCache] = None,
+        cache_dir: str = 'data/embedding_cache'
+    ):
+        # Without an explicit encoder, EMBEDDING_ENCODER selects one
+        self.encoder = encoder or encoder_from_env(cache_dir)
+        self.cache = cache or EmbeddingCache(directory=cache_dir)
+        self.kmeans = None
+
+    def cluster(self, papers: List[Paper], n_clusters: int = 5) -> Tuple[List[Paper], List[dict]]:
+        """Cluster papers using K-means on document embeddings."""
+        # Prepare documents
+        documents = [paper.get_text_for_clustering() for paper in papers]
+
+        # Embed papers, encoding only those missing from the cache
+        self.encoder.prepare(documents)
+        embeddings = self.cache.get_embeddings(papers, self.encoder)
+        self.features = embeddings
+
+        # Perform K-means clustering on unit-length embeddings
+        self.kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        cluster_labels = self.kmeans.fit_predict(embeddings)
+
+        # Embeddings have no vocabulary, so describe clusters by the terms
+        # most over-represented in their papers relative to the corpus
+        counter = CountVectorizer(
+            max_features=1000,
+            stop_words='english',
+            ngram_range=(1, 2),
+            min_df=2,
+            max_df=0.8
+        )
+        counts = counter.fit_transform(documents)
+        feature_names = counter.get_feature_names_out()
+        corpus_freq = np.asarray(counts.sum(axis=0)).ravel()
+        corpus_freq = corpus_freq / max(corpus_freq.sum(), 1)
+
+        # Create cluster metadata
+        cluster_metadata = []
+        for i in range(n_clusters):
+            cluster_indices = np.where(cluster_labels == i)[0]
+            cluster_freq = np.asarray(counts[cluster_indices].sum(axis=0)).ravel()
+            if cluster_freq.sum() > 0:
+                lift = cluster_freq / cluster_freq.sum() - corpus_freq
+                top_indices = lift.argsort()[-10:][::-1]
+                top_terms = [feature_names[idx] for idx in top_indices if cluster_freq[idx] > 0]
+            else:
+                top_terms = []
+
+            if not top_terms:
+                top_terms = [f"term_{j}" for j in range(3)]
+
+            cluster_name = f"Theme {i+1}: {', '.join(top_terms[:3])}"
+
+            cluster_metadata.append({
+                'id': i,
+                'name': cluster_name,
+                'top_words': top_terms[:10],
+                'size': len(cluster_indices)
+            })
+
+        # Assign clusters to papers
+        for idx, paper in enumerate(papers):
+            paper.cluster_id = int(cluster_labels[idx])
+            paper.cluster_name = cluster_metadata[cluster_labels[idx]]['name']
+
+        return papers, cluster_metadata
+
+    def get_method_name(self) -> str:
+        """Get the name of the clustering method."""
+        return "Embedding (K-means)"
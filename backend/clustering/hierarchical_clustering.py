@@ -31,6 +31,7 @@ class HierarchicalClustering(BaseClustering):
             max_df=0.8
         )
         tfidf_matrix = self.vectorizer.fit_transform(documents)
+        self.features = tfidf_matrix
         
         # Perform hierarchical clustering
         self.clustering = AgglomerativeClustering(
@@ -31,6 +31,7 @@ class KMeansClustering(BaseClustering):
             max_df=0.8
         )
         tfidf_matrix = self.vectorizer.fit_transform(documents)
+        self.features = tfidf_matrix
         
         # Perform K-means clustering
         self.kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
@@ -6,6 +6,7 @@ import gensim
 from gensim import corpora
 from gensim.models import LdaModel
 import re
+import numpy as np
 from backend.models.paper import Paper
 from backend.clustering.base_clustering import BaseClustering
 
@@ -16,6 +17,7 @@ class LDAClustering(BaseClustering):
     def __init__(self):
         self.model = None
         self.dictionary = None
+        self.corpus = None
     
     def _preprocess_text(self, text: str) -> List[str]:
         """Preprocess text for LDA."""
@@ -43,6 +45,7 @@ class LDAClustering(BaseClustering):
         # Filter extremes
         self.dictionary.filter_extremes(no_below=2, no_above=0.5)
         corpus = [self.dictionary.doc2bow(doc) for doc in documents]
+        self.corpus = corpus
         
         # Train LDA model
         self.model = LdaModel(
@@ -67,8 +70,11 @@ class LDAClustering(BaseClustering):
             })
         
         # Assign each paper to its dominant topic
+        self.features = np.zeros((len(papers), n_clusters))
         for idx, paper in enumerate(papers):
             doc_topics = self.model.get_document_topics(corpus[idx])
+            for topic, probability in doc_topics:
+                self.features[idx, topic] = probability
             # Get the topic with highest probability
             dominant_topic = max(doc_topics, key=lambda x: x[1])
             paper.cluster_id = dominant_topic[0]
@@ -79,4 +85,15 @@ class LDAClustering(BaseClustering):
     def get_method_name(self) -> str:
         """Get the name of the clustering method."""
         return "LDA (Latent Dirichlet Allocation)"
+    
+    def get_coherence(self) -> float:
+        """Get the UMass topic coherence of the fitted model."""
+        from gensim.models import CoherenceModel
+        coherence_model = CoherenceModel(
+            model=self.model,
+            corpus=self.corpus,
+            dictionary=self.dictionary,
+            coherence='u_mass'
+        )
+        return coherence_model.get_coherence()
 
@@ -0,0 +1,25 @@
+"""
+Registry of clustering methods.
+
+Clusterer modules pull in sklearn, scipy or gensim, so they are only
+imported when a method is first used rather than when the API starts.
+"""
+from importlib import import_module
+from backend.clustering.base_clustering import BaseClustering
+
+
+# Method name -> (module path, class name)
+CLUSTERING_METHODS = {
+    "kmeans": ("backend.clustering.kmeans_clustering", "KMeansClustering"),
+    "lda": ("backend.clustering.lda_clustering", "LDAClustering"),
+    "hierarchical": ("backend.clustering.hierarchical_clustering", "HierarchicalClustering"),
+    "embedding": ("backend.clustering.embedding_clustering", "EmbeddingClustering"),
+}
+
+
+def get_clusterer(method: str) -> BaseClustering:
+    """Import and instantiate the clusterer for a method."""
+    if method not in CLUSTERING_METHODS:
+        raise ValueError(f"Unknown clustering method: {method}")
+    module_path, class_name = CLUSTERING_METHODS[method]
+    return getattr(import_module(module_path), class_name)()
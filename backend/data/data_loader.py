@@ -2,7 +2,8 @@
 Data loading utilities for academic papers.
 """
 import json
-from typing import List
+import os
+from typing import List, Optional
 from backend.models.paper import Paper
 
 
@@ -29,3 +30,20 @@ def load_papers(filepath: str = 'data/sample_papers.json') -> List[Paper]:
         save_papers_to_json(papers, filepath)
         return papers
 
+
+def save_cluster_state(state: dict, filepath: str = 'data/cluster_state.json'):
+    """Persist the latest clustering result so restarts can serve it immediately."""
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, filepath)
+
+
+def load_cluster_state(filepath: str = 'data/cluster_state.json') -> Optional[dict]:
+    """Load a persisted clustering result, or None if there is none."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
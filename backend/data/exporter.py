@@ -0,0 +1,233 @@
+"""
+Streaming export of the clustered corpus.
+
+Rows are encoded chunk by chunk from a snapshot of the current state and
+yielded as compressed bytes, so memory use is bounded by the chunk size
+rather than the corpus size and clients can start reading immediately.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Iterator, List, Optional, Tuple
+from backend.models.paper import Paper
+
+
+EXPORT_FORMATS = {
+    'ndjson': {'media_type': 'application/x-ndjson', 'extension': 'ndjson'},
+    'csv': {'media_type': 'text/csv', 'extension': 'csv'},
+    'arrow': {'media_type': 'application/vnd.apache.arrow.stream', 'extension': 'arrows'},
+    'parquet': {'media_type': 'application/vnd.apache.parquet', 'extension': 'parquet'},
+}
+
+COMPRESSIONS = {
+    'none': {'media_type': None, 'extension': ''},
+    'gzip': {'media_type': 'application/gzip', 'extension': '.gz'},
+    'zstd': {'media_type': 'application/zstd', 'extension': '.zst'},
+}
+
+CSV_COLUMNS = [
+    'id', 'title', 'authors', 'abstract', 'keywords', 'year', 'venue',
+    'citations', 'cluster_id', 'cluster_name', 'cluster_top_words', 'cluster_size',
+]
+
+# (paper, cluster id, cluster name) captured when the export starts
+Snapshot = List[Tuple[Paper, Optional[int], Optional[str]]]
+
+
+def take_snapshot(papers: List[Paper]) -> Snapshot:
+    """Capture cluster assignments so a concurrent recluster cannot mix runs."""
+    return [(paper, paper.cluster_id, paper.cluster_name) for paper in papers]
+
+
+def _rows(entries: Snapshot, by_id: dict) -> List[dict]:
+    """Build export rows for a slice of the snapshot."""
+    rows = []
+    for paper, cluster_id, cluster_name in entries:
+        cluster = by_id.get(cluster_id, {})
+        row = paper.to_dict()
+        row['cluster_id'] = cluster_id
+        row['cluster_name'] = cluster_name
+        row['cluster_top_words'] = cluster.get('top_words', [])
+        row['cluster_size'] = cluster.get('size')
+        rows.append(row)
+    return rows
+
+
+def _chunks(snapshot: Snapshot, clusters: List[dict], chunk_size: int) -> Iterator[List[dict]]:
+    """Yield export rows in chunks."""
+    by_id = {cluster['id']: cluster for cluster in clusters}
+    for start in range(0, len(snapshot), chunk_size):
+        yield _rows(snapshot[start:start + chunk_size], by_id)
+
+
+def _ndjson(snapshot: Snapshot, clusters: List[dict], chunk_size: int, compression: str) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON."""
+    for rows in _chunks(snapshot, clusters, chunk_size):
+        yield ''.join(json.dumps(row) + '\n' for row in rows).encode('utf-8')
+
+
+def _csv(snapshot: Snapshot, clusters: List[dict], chunk_size: int, compression: str) -> Iterator[bytes]:
+    """Encode rows as CSV, joining list fields with semicolons."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for rows in _chunks(snapshot, clusters, chunk_size):
+        for row in rows:
+            for field in ('authors', 'keywords', 'cluster_top_words'):
+                row[field] = ';'.join(row[field])
+            writer.writerow(row)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream collecting bytes until they are drained."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def _arrow_schema(clusters: List[dict]):
+    """Arrow schema of export rows, with cluster metadata attached."""
+    import pyarrow as pa
+
+    return pa.schema([
+        ('id', pa.string()),
+        ('title', pa.string()),
+        ('authors', pa.list_(pa.string())),
+        ('abstract', pa.string()),
+        ('keywords', pa.list_(pa.string())),
+        ('year', pa.int32()),
+        ('venue', pa.string()),
+        ('citations', pa.int64()),
+        ('cluster_id', pa.int32()),
+        ('cluster_name', pa.string()),
+        ('cluster_top_words', pa.list_(pa.string())),
+        ('cluster_size', pa.int64()),
+    ], metadata={'clusters': json.dumps(clusters)})
+
+
+def _arrow(snapshot: Snapshot, clusters: List[dict], chunk_size: int, compression: str) -> Iterator[bytes]:
+    """Encode rows as an Arrow IPC stream of record batches."""
+    import pyarrow as pa
+
+    schema = _arrow_schema(clusters)
+    sink = _ChunkSink()
+    options = pa.ipc.IpcWriteOptions(compression=None if compression == 'none' else compression)
+    with pa.ipc.new_stream(sink, schema, options=options) as writer:
+        for rows in _chunks(snapshot, clusters, chunk_size):
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _parquet(snapshot: Snapshot, clusters: List[dict], chunk_size: int, compression: str) -> Iterator[bytes]:
+    """Encode rows as Parquet with one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(clusters)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for rows in _chunks(snapshot, clusters, chunk_size):
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _compress(chunks: Iterator[bytes], compression: str) -> Iterator[bytes]:
+    """
+    Wrap a byte stream in streaming gzip or zstd compression.
+
+    Each chunk is flushed to a block boundary so clients can decompress
+    everything received so far.
+    """
+    if compression == 'gzip':
+        compressor = zlib.compressobj(wbits=31)
+        block_flush = zlib.Z_SYNC_FLUSH
+    else:
+        import zstandard
+        compressor = zstandard.ZstdCompressor().compressobj()
+        block_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(block_flush)
+    yield compressor.flush()
+
+
+ENCODERS = {
+    'ndjson': _ndjson,
+    'csv': _csv,
+    'arrow': _arrow,
+    'parquet': _parquet,
+}
+
+
+def check_export_support(fmt: str, compression: str):
+    """
+    Validate an export format and compression.
+
+    Raises:
+        ValueError: If the combination is not supported
+        ImportError: If an optional dependency is missing
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if fmt == 'arrow' and compression == 'gzip':
+        raise ValueError("Arrow streams support only zstd compression")
+    if fmt in ('arrow', 'parquet'):
+        import pyarrow  # noqa: F401
+    if compression == 'zstd' and fmt in ('ndjson', 'csv'):
+        import zstandard  # noqa: F401
+
+
+def stream_export(
+    snapshot: Snapshot,
+    clusters: List[dict],
+    fmt: str = 'ndjson',
+    compression: str = 'none',
+    chunk_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Stream the clustered corpus in the requested format.
+
+    Text formats are compressed as a whole stream; Arrow and Parquet use
+    their own column compression so the output stays a valid file.
+    """
+    chunks = ENCODERS[fmt](snapshot, clusters, chunk_size, compression)
+    if compression == 'none' or fmt in ('arrow', 'parquet'):
+        return (chunk for chunk in chunks if chunk)
+    return _compress(chunks, compression)
+
+
+def export_filename(fmt: str, compression: str) -> str:
+    """File name for an export download."""
+    suffix = COMPRESSIONS[compression]['extension'] if fmt in ('ndjson', 'csv') else ''
+    return f"papers.{EXPORT_FORMATS[fmt]['extension']}{suffix}"
+
+
+def export_media_type(fmt: str, compression: str) -> str:
+    """Media type for an export download."""
+    if fmt in ('ndjson', 'csv') and compression != 'none':
+        return COMPRESSIONS[compression]['media_type']
+    return EXPORT_FORMATS[fmt]['media_type']
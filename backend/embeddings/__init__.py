@@ -0,0 +1,2 @@
+# Document embedding module
+
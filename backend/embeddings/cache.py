@@ -0,0 +1,141 @@
+"""
+On-disk cache of document embeddings keyed by paper id.
+
+Each encoder fingerprint gets its own store holding paper ids, a hash of
+the text each embedding was computed from, and the embedding matrix. Only
+papers that are new, or whose text changed, are sent to the encoder.
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+import numpy as np
+from backend.models.paper import Paper
+from backend.embeddings.encoders import BaseEncoder
+
+
+def _text_hash(text: str) -> str:
+    """Hash document text to detect changed papers."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+# Encoder of a pool worker process, set up once by _init_worker
+_worker_encoder: Optional[BaseEncoder] = None
+
+
+def _init_worker(encoder: BaseEncoder):
+    """Prepare one encoder per worker so models are not reloaded per batch."""
+    global _worker_encoder
+    encoder.prepare([])
+    _worker_encoder = encoder
+
+
+def _encode_in_worker(texts: List[str]) -> np.ndarray:
+    """Encode a batch with the worker's encoder."""
+    return _worker_encoder.encode(texts)
+
+
+class EmbeddingCache:
+    """Persistent per-paper embedding cache with batched encoding."""
+
+    def __init__(
+        self,
+        directory: str = 'data/embedding_cache',
+        batch_size: int = 256,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ):
+        """
+        Args:
+            directory: Directory holding one store per encoder fingerprint
+            batch_size: Number of documents per encoder call
+            max_workers: Size of the worker pool (defaults to the executor's)
+            use_processes: Encode batches in a process pool instead of
+                threads, for encoders that hold the GIL
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+
+    def _store_path(self, encoder: BaseEncoder) -> str:
+        """Path of the store for an encoder."""
+        return os.path.join(self.directory, f"{encoder.fingerprint()}.npz")
+
+    def _load(self, path: str):
+        """Load a store as ({paper id: (text hash, row)}, vectors)."""
+        if not os.path.exists(path):
+            return {}, None
+        with np.load(path, allow_pickle=False) as store:
+            ids, hashes, vectors = store['ids'], store['hashes'], store['vectors']
+        index = {str(pid): (str(h), row) for row, (pid, h) in enumerate(zip(ids, hashes))}
+        return index, vectors
+
+    def _save(self, path: str, ids: List[str], hashes: List[str], vectors: np.ndarray):
+        """Atomically write a store."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, ids=np.array(ids), hashes=np.array(hashes), vectors=vectors)
+        os.replace(tmp_path, path)
+
+    def _encode(self, encoder: BaseEncoder, texts: List[str]) -> np.ndarray:
+        """Encode texts in batches over a worker pool."""
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1:
+            return encoder.encode(batches[0])
+        if self.use_processes:
+            # The encoder is pickled once per worker rather than once per batch
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_worker, initargs=(encoder,)
+            )
+            encode = _encode_in_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            encode = encoder.encode
+        with executor:
+            return np.vstack(list(executor.map(encode, batches)))
+
+    def get_embeddings(self, papers: List[Paper], encoder: BaseEncoder) -> np.ndarray:
+        """
+        Get embeddings for papers, encoding only those not already cached.
+
+        Args:
+            papers: Papers to embed
+            encoder: Prepared encoder
+
+        Returns:
+            Array with one embedding row per paper, in input order
+        """
+        if not papers:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        path = self._store_path(encoder)
+        index, cached = self._load(path)
+
+        texts = [paper.get_text_for_clustering() for paper in papers]
+        hashes = [_text_hash(text) for text in texts]
+
+        missing = [
+            idx for idx, (paper, text_hash) in enumerate(zip(papers, hashes))
+            if index.get(paper.id, (None,))[0] != text_hash
+        ]
+        if not missing and cached is not None:
+            return cached[[index[paper.id][1] for paper in papers]]
+
+        fresh = self._encode(encoder, [texts[idx] for idx in missing]) if missing else None
+        fresh_ids = {papers[idx].id for idx in missing}
+
+        # Keep cached entries that were not re-encoded, then append fresh ones
+        kept = [(paper_id, entry) for paper_id, entry in index.items() if paper_id not in fresh_ids]
+        ids = [paper_id for paper_id, _ in kept] + [papers[idx].id for idx in missing]
+        store_hashes = [text_hash for _, (text_hash, _) in kept] + [hashes[idx] for idx in missing]
+        parts = []
+        if kept:
+            parts.append(cached[[row for _, (_, row) in kept]])
+        if fresh is not None:
+            parts.append(fresh)
+        vectors = np.vstack(parts).astype(np.float32)
+        self._save(path, ids, store_hashes, vectors)
+
+        positions = {paper_id: row for row, paper_id in enumerate(ids)}
+        return vectors[[positions[paper.id] for paper in papers]]
@@ -0,0 +1,219 @@
+"""
+Pluggable document encoders producing dense embeddings.
+
+Encoders must be deterministic once prepared, so that an embedding
+computed for a paper can be cached and reused across clustering runs.
+"""
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from typing import List, Optional
+import numpy as np
+
+
+class BaseEncoder(ABC):
+    """Abstract base class for document encoders."""
+
+    def prepare(self, texts: List[str]):
+        """
+        Make the encoder ready to encode, e.g. by loading or fitting a model.
+
+        Args:
+            texts: Documents of the current corpus, for encoders that need
+                to be fitted before use
+        """
+        pass
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode documents into dense vectors.
+
+        Args:
+            texts: Documents to encode
+
+        Returns:
+            Array of shape (len(texts), dimension) with L2-normalised rows
+        """
+        pass
+
+    @abstractmethod
+    def fingerprint(self) -> str:
+        """Identify the encoder and its parameters for cache keys."""
+        pass
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit L2 norm, leaving zero rows untouched."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class HashingSVDEncoder(BaseEncoder):
+    """
+    CPU-only, offline encoder: hashed word and character n-grams projected
+    onto a truncated SVD basis.
+
+    Hashing needs no vocabulary, so a paper's features depend only on its own
+    text. The SVD basis is fitted once and persisted to `model_path`; later
+    runs load it, which keeps embeddings stable across runs.
+    """
+
+    def __init__(
+        self,
+        n_components: int = 128,
+        n_features: int = 2 ** 14,
+        model_path: Optional[str] = None
+    ):
+        self.n_components = n_components
+        self.n_features = n_features
+        self.model_path = model_path
+        self.components = None
+        self._word_vectorizer = None
+        self._char_vectorizer = None
+
+    def _hash(self, texts: List[str]):
+        """Hash texts into sublinear, L2-normalised sparse n-gram counts."""
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.preprocessing import normalize
+        from scipy.sparse import hstack
+
+        if self._word_vectorizer is None:
+            self._word_vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                stop_words='english',
+                ngram_range=(1, 2),
+                alternate_sign=False,
+                norm=None
+            )
+            self._char_vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                analyzer='char_wb',
+                ngram_range=(3, 5),
+                alternate_sign=False,
+                norm=None
+            )
+        features = hstack([
+            self._word_vectorizer.transform(texts),
+            self._char_vectorizer.transform(texts),
+        ]).tocsr()
+        features.data = np.log1p(features.data)
+        return normalize(features)
+
+    def _basis_shape(self, n_texts: int) -> tuple:
+        """Shape of the SVD basis fitted on a corpus of n_texts documents."""
+        n_columns = 2 * self.n_features
+        return max(1, min(self.n_components, n_texts - 1, n_columns - 1)), n_columns
+
+    def prepare(self, texts: List[str]):
+        """Load the SVD basis from disk, or fit it on `texts` and save it."""
+        if self.components is not None:
+            return
+        if self.model_path and os.path.exists(self.model_path):
+            with np.load(self.model_path) as model:
+                components = model['components']
+            # A basis saved with other parameters is refitted and overwritten
+            if components.shape == self._basis_shape(len(texts)):
+                self.components = components
+                return
+        self.fit(texts)
+        if self.model_path:
+            os.makedirs(os.path.dirname(self.model_path) or '.', exist_ok=True)
+            np.savez(self.model_path, components=self.components)
+
+    def fit(self, texts: List[str]):
+        """Fit the SVD basis on a corpus."""
+        from sklearn.decomposition import TruncatedSVD
+
+        features = self._hash(texts)
+        n_components, _ = self._basis_shape(features.shape[0])
+        svd = TruncatedSVD(n_components=n_components, random_state=42)
+        svd.fit(features)
+        self.components = svd.components_.astype(np.float32)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Project hashed n-gram features onto the SVD basis."""
+        if self.components is None:
+            raise RuntimeError("HashingSVDEncoder must be prepared before encoding")
+        features = self._hash(texts)
+        return _normalize_rows(np.asarray(features @ self.components.T, dtype=np.float32))
+
+    def fingerprint(self) -> str:
+        """Identify the encoder by its parameters and fitted basis."""
+        digest = hashlib.sha1(self.components.tobytes()).hexdigest()[:12] if self.components is not None else 'unfitted'
+        return f"hashing-svd-{self.n_features}-{self.n_components}-{digest}"
+
+    def __getstate__(self):
+        # Vectorizers are rebuilt lazily, keeping process-pool pickles small
+        state = self.__dict__.copy()
+        state['_word_vectorizer'] = None
+        state['_char_vectorizer'] = None
+        return state
+
+
+class SentenceTransformerEncoder(BaseEncoder):
+    """Encoder backed by a local sentence-transformers model."""
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', device: str = 'cpu'):
+        self.model_name = model_name
+        self.device = device
+        self.model = None
+
+    def prepare(self, texts: List[str]):
+        """Load the model; requires the optional sentence-transformers package."""
+        if self.model is not None:
+            return
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "SentenceTransformerEncoder requires the sentence-transformers package"
+            ) from e
+        self.model = SentenceTransformer(self.model_name, device=self.device)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the sentence-transformers model."""
+        if self.model is None:
+            self.prepare(texts)
+        vectors = self.model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+    def fingerprint(self) -> str:
+        """Identify the encoder by its model name."""
+        return f"sentence-transformer-{self.model_name.replace('/', '_')}"
+
+    def __getstate__(self):
+        # Worker processes load their own copy of the model
+        state = self.__dict__.copy()
+        state['model'] = None
+        return state
+
+
+ENCODERS = {
+    'hashing-svd': HashingSVDEncoder,
+    'sentence-transformer': SentenceTransformerEncoder,
+}
+
+
+def get_encoder(name: str, **kwargs) -> BaseEncoder:
+    """Create an encoder by its registered name."""
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown encoder: {name}")
+    return ENCODERS[name](**kwargs)
+
+
+def encoder_from_env(cache_dir: str) -> BaseEncoder:
+    """
+    Create the encoder selected by the EMBEDDING_ENCODER environment variable.
+
+    Defaults to 'hashing-svd' with its basis stored in `cache_dir`;
+    EMBEDDING_MODEL picks the model of the sentence-transformer encoder.
+    """
+    name = os.environ.get('EMBEDDING_ENCODER', 'hashing-svd')
+    if name == 'hashing-svd':
+        return HashingSVDEncoder(model_path=f"{cache_dir}/hashing_svd_model.npz")
+    kwargs = {}
+    if name == 'sentence-transformer' and os.environ.get('EMBEDDING_MODEL'):
+        kwargs['model_name'] = os.environ['EMBEDDING_MODEL']
+    return get_encoder(name, **kwargs)
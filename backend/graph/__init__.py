@@ -0,0 +1,2 @@
+# Author graph module
+
@@ -0,0 +1,305 @@
+"""
+Co-authorship graph over the paper corpus.
+
+Authors are mapped to integer ids. Per-author edge dictionaries are the
+source of truth and are updated in place as papers are added. A CSR
+adjacency snapshot serves neighbourhood queries for authors untouched
+since it was built, and is only rebuilt once enough rows have gone stale.
+Connected components are tracked with a union-find structure plus
+per-root member lists, which only ever need merges because papers are
+never removed. Listings are served from sorted keys that are patched with
+bisect as authors are added, and name filters use a prefix index over the
+words of author names, so requests do not scan the whole corpus.
+"""
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Set
+import numpy as np
+from backend.models.paper import Paper
+from backend.search.ranker import tokenize
+
+
+class CoauthorGraph:
+    """Author co-authorship graph with incrementally maintained analytics."""
+
+    # Rebuild the CSR once this fraction of its rows is stale
+    CSR_REBUILD_FRACTION = 0.25
+
+    def __init__(self, papers: Optional[List[Paper]] = None):
+        self.papers: List[Paper] = []
+        self.author_ids: Dict[str, int] = {}
+        self.author_names: List[str] = []
+        self.author_papers: List[List[int]] = []
+        self.author_citations: List[int] = []
+
+        # Mutable edge weights: author id -> {collaborator id: shared papers}
+        self._edges: List[Dict[int, int]] = []
+        # Union-find parents, and member lists keyed by component root
+        self._parent: List[int] = []
+        self._members: Dict[int, List[int]] = {}
+
+        # CSR snapshot and the authors whose rows changed since it was built
+        self._csr = None
+        self._stale: Set[int] = set()
+        # Sorted (-paper count, name, id) keys, built on first listing
+        self._ranking: Optional[List[tuple]] = None
+        # Sorted (-size, root) keys, built on first listing, and member
+        # lists in author id order, cached per root until it merges
+        self._component_ranking: Optional[List[tuple]] = None
+        self._sorted_members: Dict[int, List[int]] = {}
+        # Name word -> author ids, with the words kept sorted for prefix lookups
+        self._name_index: Dict[str, Set[int]] = {}
+        self._name_words: List[str] = []
+        self._cluster_cache: Dict[int, Dict[int, int]] = {}
+
+        self.add_papers(papers or [])
+
+    def _ranking_key(self, author_id: int) -> tuple:
+        return (-len(self.author_papers[author_id]), self.author_names[author_id], author_id)
+
+    def _author_id(self, name: str) -> int:
+        """Get the id of an author, registering them if unseen."""
+        author_id = self.author_ids.get(name)
+        if author_id is None:
+            author_id = len(self.author_names)
+            self.author_ids[name] = author_id
+            self.author_names.append(name)
+            self.author_papers.append([])
+            self.author_citations.append(0)
+            self._edges.append({})
+            self._parent.append(author_id)
+            self._members[author_id] = [author_id]
+            if self._ranking is not None:
+                insort(self._ranking, self._ranking_key(author_id))
+            if self._component_ranking is not None:
+                insort(self._component_ranking, (-1, author_id))
+            for word in set(tokenize(name)):
+                if word not in self._name_index:
+                    self._name_index[word] = set()
+                    insort(self._name_words, word)
+                self._name_index[word].add(author_id)
+        return author_id
+
+    def _find(self, author_id: int) -> int:
+        """Find the component root of an author with path halving."""
+        parent = self._parent
+        while parent[author_id] != author_id:
+            parent[author_id] = parent[parent[author_id]]
+            author_id = parent[author_id]
+        return author_id
+
+    def _union(self, a: int, b: int):
+        """Merge the components of two authors, moving the smaller member list."""
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if len(self._members[root_a]) < len(self._members[root_b]):
+            root_a, root_b = root_b, root_a
+        if self._component_ranking is not None:
+            for root in (root_a, root_b):
+                key = (-len(self._members[root]), root)
+                del self._component_ranking[bisect_left(self._component_ranking, key)]
+        self._parent[root_b] = root_a
+        self._members[root_a].extend(self._members.pop(root_b))
+        self._sorted_members.pop(root_a, None)
+        self._sorted_members.pop(root_b, None)
+        if self._component_ranking is not None:
+            insort(self._component_ranking, (-len(self._members[root_a]), root_a))
+
+    def add_papers(self, papers: List[Paper]):
+        """Add papers to the graph, updating edges and components in place."""
+        for paper in papers:
+            self.add_paper(paper)
+
+    def add_paper(self, paper: Paper):
+        """Add a single paper, touching only the rows of its authors."""
+        paper_idx = len(self.papers)
+        self.papers.append(paper)
+
+        # Deduplicate while keeping author order stable
+        names = list(dict.fromkeys(name.strip() for name in paper.authors if name.strip()))
+        ids = [self._author_id(name) for name in names]
+        for author_id in ids:
+            if self._ranking is not None:
+                old_key = self._ranking_key(author_id)
+                del self._ranking[bisect_left(self._ranking, old_key)]
+            self.author_papers[author_id].append(paper_idx)
+            self.author_citations[author_id] += paper.citations
+            if self._ranking is not None:
+                insort(self._ranking, self._ranking_key(author_id))
+            self._cluster_cache.pop(author_id, None)
+
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                self._edges[a][b] = self._edges[a].get(b, 0) + 1
+                self._edges[b][a] = self._edges[b].get(a, 0) + 1
+                self._union(a, b)
+
+        if self._csr is not None and len(ids) > 1:
+            self._stale.update(ids)
+
+    def refresh_clusters(self):
+        """Drop cached cluster distributions after papers are re-clustered."""
+        self._cluster_cache.clear()
+
+    @property
+    def num_authors(self) -> int:
+        """Number of distinct authors in the graph."""
+        return len(self.author_names)
+
+    def has_author(self, author_id: int) -> bool:
+        """Check whether an author id exists."""
+        return 0 <= author_id < self.num_authors
+
+    def _adjacency(self):
+        """Get the CSR adjacency as (indptr, indices, weights), rebuilding it if too stale."""
+        if self._csr is None or len(self._stale) > self.CSR_REBUILD_FRACTION * self.num_authors:
+            degrees = np.array([len(edges) for edges in self._edges], dtype=np.int64)
+            indptr = np.zeros(self.num_authors + 1, dtype=np.int64)
+            np.cumsum(degrees, out=indptr[1:])
+            indices = np.empty(indptr[-1], dtype=np.int32)
+            weights = np.empty(indptr[-1], dtype=np.int32)
+            for author_id, edges in enumerate(self._edges):
+                start, end = indptr[author_id], indptr[author_id + 1]
+                if start == end:
+                    continue
+                neighbours = sorted(edges)
+                indices[start:end] = neighbours
+                weights[start:end] = [edges[n] for n in neighbours]
+            self._csr = (indptr, indices, weights)
+            self._stale = set()
+        return self._csr
+
+    def _neighbours(self, author_id: int):
+        """Get an author's (collaborator ids, shared paper counts) arrays."""
+        indptr, indices, weights = self._adjacency()
+        if author_id in self._stale or author_id >= len(indptr) - 1:
+            # Row changed since the snapshot: read the live edge dictionary
+            edges = self._edges[author_id]
+            neighbours = np.fromiter(sorted(edges), dtype=np.int32, count=len(edges))
+            shared = np.array([edges[n] for n in neighbours.tolist()], dtype=np.int32)
+            return neighbours, shared
+        start, end = indptr[author_id], indptr[author_id + 1]
+        return indices[start:end], weights[start:end]
+
+    def degree(self, author_id: int) -> int:
+        """Number of distinct collaborators of an author."""
+        return len(self._edges[author_id])
+
+    def collaborators(self, author_id: int, limit: Optional[int] = None) -> List[dict]:
+        """Get an author's collaborators ordered by number of shared papers."""
+        neighbours, shared = self._neighbours(author_id)
+        # Stable sort keeps ties in author id order
+        order = np.argsort(-shared, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return [
+            {
+                'id': int(neighbours[idx]),
+                'name': self.author_names[neighbours[idx]],
+                'shared_papers': int(shared[idx]),
+            }
+            for idx in order
+        ]
+
+    def cluster_distribution(self, author_id: int) -> Dict[int, int]:
+        """Count an author's papers per cluster."""
+        distribution = self._cluster_cache.get(author_id)
+        if distribution is None:
+            counts = Counter(
+                self.papers[idx].cluster_id
+                for idx in self.author_papers[author_id]
+                if self.papers[idx].cluster_id is not None
+            )
+            distribution = dict(sorted(counts.items()))
+            self._cluster_cache[author_id] = distribution
+        return distribution
+
+    def component_of(self, author_id: int) -> dict:
+        """Get the id and size of the component containing an author."""
+        root = self._find(author_id)
+        return {'id': root, 'size': len(self._members[root])}
+
+    @property
+    def num_components(self) -> int:
+        """Number of connected components in the graph."""
+        return len(self._members)
+
+    def _component_members(self, root: int) -> List[int]:
+        """Get the members of a component in author id order."""
+        members = self._sorted_members.get(root)
+        if members is None:
+            members = sorted(self._members[root])
+            self._sorted_members[root] = members
+        return members
+
+    def components(self, limit: Optional[int] = None, member_limit: int = 20) -> List[dict]:
+        """List connected components, largest first, with up to member_limit author names each."""
+        if self._component_ranking is None:
+            self._component_ranking = sorted((-len(members), root) for root, members in self._members.items())
+        keys = self._component_ranking if limit is None else self._component_ranking[:limit]
+        return [
+            {
+                'id': root,
+                'size': -negative_size,
+                'authors': [self.author_names[a] for a in self._component_members(root)[:member_limit]],
+            }
+            for negative_size, root in keys
+        ]
+
+    def h_index(self, author_id: int) -> int:
+        """Compute the h-index of an author over the loaded corpus."""
+        citations = sorted(
+            (self.papers[idx].citations for idx in self.author_papers[author_id]),
+            reverse=True
+        )
+        return sum(1 for rank, count in enumerate(citations, start=1) if count >= rank)
+
+    def profile(self, author_id: int) -> dict:
+        """Build the profile of an author."""
+        author_papers = [self.papers[idx] for idx in self.author_papers[author_id]]
+        years = [paper.year for paper in author_papers]
+        venues = Counter(paper.venue for paper in author_papers)
+        return {
+            'id': author_id,
+            'name': self.author_names[author_id],
+            'paper_count': len(author_papers),
+            'citations': self.author_citations[author_id],
+            'h_index': self.h_index(author_id),
+            'year_range': {'min': min(years), 'max': max(years)} if years else None,
+            'top_venues': [venue for venue, _ in venues.most_common(5)],
+            'collaborator_count': self.degree(author_id),
+            'component': self.component_of(author_id),
+            'paper_ids': [paper.id for paper in author_papers],
+        }
+
+    def _match_names(self, query: str) -> Set[int]:
+        """Find authors whose name has a word starting with each query word."""
+        matches = None
+        for word in tokenize(query):
+            start = bisect_left(self._name_words, word)
+            end = bisect_left(self._name_words, word + '\uffff')
+            ids = set().union(*(self._name_index[w] for w in self._name_words[start:end]))
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                break
+        return matches or set()
+
+    def authors(self, query: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """List authors by paper count, optionally filtered by name word prefixes."""
+        if query:
+            keys = heapq.nsmallest(limit, map(self._ranking_key, self._match_names(query)))
+        else:
+            if self._ranking is None:
+                self._ranking = sorted(self._ranking_key(a) for a in range(self.num_authors))
+            keys = self._ranking[:limit]
+        return [
+            {
+                'id': author_id,
+                'name': name,
+                'paper_count': len(self.author_papers[author_id]),
+                'citations': self.author_citations[author_id],
+            }
+            for _, name, author_id in keys
+        ]
@@ -0,0 +1,2 @@
+# Load testing module
+
@@ -0,0 +1,502 @@
+"""
+Asyncio load generator for the API.
+
+Launches a local uvicorn instance (or targets a running one) and replays a
+weighted mix of requests from concurrent virtual clients. Event-loop lag
+is read from the server's own monitor (`/api/health/loop-lag`) for an idle
+window, a window of load without reclusters, and the full mix split by
+whether a recluster was in flight, so the cost of reclusters can be told
+apart from ordinary load. Reports are saved as JSON so runs can be diffed.
+
+Usage:
+    python -m backend.loadtest.runner --duration 30 --concurrency 20 \\
+        --mix papers=40,search=40,stats=15,cluster=5 --output report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+SEARCH_TERMS = [
+    'learning', 'retrieval', 'neural networks', 'user interface', 'clustering',
+    'image recognition', 'language models', 'search', 'deep learn', 'anomaly detection',
+]
+
+CLUSTER_METHODS = ['kmeans', 'hierarchical']
+
+
+def _papers(rng: random.Random) -> Tuple[str, str]:
+    return 'GET', '/api/papers'
+
+
+def _search(rng: random.Random) -> Tuple[str, str]:
+    return 'GET', f"/api/search?q={quote(rng.choice(SEARCH_TERMS))}&limit=50"
+
+
+def _stats(rng: random.Random) -> Tuple[str, str]:
+    return 'GET', '/api/stats'
+
+
+def _clusters(rng: random.Random) -> Tuple[str, str]:
+    return 'GET', '/api/clusters'
+
+
+def _trends(rng: random.Random) -> Tuple[str, str]:
+    return 'GET', '/api/trends'
+
+
+def _cluster(rng: random.Random) -> Tuple[str, str]:
+    return 'POST', f"/api/cluster/{rng.choice(CLUSTER_METHODS)}?n_clusters={rng.randint(3, 8)}"
+
+
+# Endpoint name -> request builder; names are used in --mix and reports
+ENDPOINTS: Dict[str, Callable[[random.Random], Tuple[str, str]]] = {
+    'papers': _papers,
+    'search': _search,
+    'stats': _stats,
+    'clusters': _clusters,
+    'trends': _trends,
+    'cluster': _cluster,
+}
+
+DEFAULT_MIX = {'papers': 40, 'search': 40, 'stats': 15, 'cluster': 5}
+
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 client over asyncio streams."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.writer = None
+
+    async def request(self, method: str, path: str) -> Tuple[int, bytes]:
+        """
+        Send a request and read the full response.
+
+        Returns:
+            Tuple of (status code, body)
+        """
+        if self.writer is None:
+            await self._connect()
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            f"Content-Length: 0\r\n"
+            f"\r\n"
+        )
+        self.writer.write(head.encode('ascii'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        parts = []
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b';')[0], 16)
+                parts.append((await self.reader.readexactly(chunk_size + 2))[:-2])
+                if chunk_size == 0:
+                    break
+        elif 'content-length' in headers:
+            parts.append(await self.reader.readexactly(int(headers['content-length'])))
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, b''.join(parts)
+
+
+@dataclass
+class Sample:
+    """One completed request."""
+    endpoint: str
+    start: float
+    latency: float
+    status: int
+
+
+@dataclass
+class RunState:
+    """Shared state of a load test run."""
+    samples: List[Sample] = field(default_factory=list)
+    reclusters_in_flight: int = 0
+    recluster_seconds: float = 0.0
+
+
+def percentiles(values: List[float]) -> dict:
+    """Summarise latencies in milliseconds."""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        'count': len(ordered),
+        'mean': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50': round(pick(0.50) * 1000, 3),
+        'p90': round(pick(0.90) * 1000, 3),
+        'p95': round(pick(0.95) * 1000, 3),
+        'p99': round(pick(0.99) * 1000, 3),
+        'max': round(ordered[-1] * 1000, 3),
+    }
+
+
+async def client_worker(
+    host: str,
+    port: int,
+    mix: Dict[str, int],
+    deadline: float,
+    state: RunState,
+    rng: random.Random,
+    think_time: float
+):
+    """Virtual client issuing requests from the mix until the deadline."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    connection = HTTPConnection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(names, weights)[0]
+            method, path = ENDPOINTS[endpoint](rng)
+            is_recluster = endpoint == 'cluster'
+            if is_recluster:
+                state.reclusters_in_flight += 1
+            start = time.perf_counter()
+            try:
+                status, _ = await connection.request(method, path)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                await connection.close()
+                status = 0
+            latency = time.perf_counter() - start
+            if is_recluster:
+                state.reclusters_in_flight -= 1
+                state.recluster_seconds += latency
+            state.samples.append(Sample(endpoint, start, latency, status))
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+    finally:
+        await connection.close()
+
+
+async def loop_lag(host: str, port: int, since: Optional[float] = None) -> dict:
+    """Read the server's event-loop lag summary for samples after `since`."""
+    path = '/api/health/loop-lag' + (f"?since={since!r}" if since is not None else '')
+    connection = HTTPConnection(host, port)
+    try:
+        status, body = await connection.request('GET', path)
+    finally:
+        await connection.close()
+    if status != 200:
+        raise RuntimeError(f"Loop lag query failed with status {status}")
+    return json.loads(body)
+
+
+async def wait_until_ready(
+    host: str,
+    port: int,
+    timeout: float,
+    server: Optional[subprocess.Popen] = None
+):
+    """Poll /api/ready until the server reports ready, failing fast if a launched server exits."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode} before becoming ready")
+        connection = HTTPConnection(host, port)
+        try:
+            # Bounded, so a port held by an unresponsive process cannot stall the loop
+            status, _ = await asyncio.wait_for(connection.request('GET', '/api/ready'), timeout=2.0)
+            if status == 200:
+                return
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, IndexError):
+            pass
+        finally:
+            await connection.close()
+        await asyncio.sleep(0.1)
+    raise TimeoutError(f"Server at {host}:{port} not ready after {timeout}s")
+
+
+def summarize_samples(samples: List[Sample], duration: float) -> dict:
+    """Request count, errors, throughput and latency of a set of samples."""
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for s in samples if not 200 <= s.status < 400),
+        'throughput_rps': round(len(samples) / duration, 3),
+        'latency_ms': percentiles([s.latency for s in samples]),
+    }
+
+
+def build_report(
+    config: dict,
+    state: RunState,
+    started_at: str,
+    duration: float,
+    loop_lag_ms: dict,
+    load_only: Optional[dict] = None
+) -> dict:
+    """Aggregate samples into a JSON-serialisable report."""
+    endpoints = {}
+    for name in sorted({sample.endpoint for sample in state.samples}):
+        endpoints[name] = summarize_samples([s for s in state.samples if s.endpoint == name], duration)
+
+    return {
+        'config': config,
+        'started_at': started_at,
+        'duration_s': round(duration, 3),
+        'totals': summarize_samples(state.samples, duration),
+        'endpoints': endpoints,
+        'load_only': load_only,
+        'event_loop_lag_ms': loop_lag_ms,
+        'reclusters': {
+            'requests': endpoints.get('cluster', {}).get('requests', 0),
+            'busy_s': round(state.recluster_seconds, 3),
+        },
+    }
+
+
+async def run_clients(
+    host: str,
+    port: int,
+    mix: Dict[str, int],
+    duration: float,
+    concurrency: int,
+    rng: random.Random,
+    think_time: float
+) -> Tuple[RunState, float]:
+    """Run virtual clients for a duration and return their samples and the elapsed time."""
+    state = RunState()
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        client_worker(host, port, mix, deadline, state, random.Random(rng.random()), think_time)
+        for _ in range(concurrency)
+    ])
+    return state, time.perf_counter() - start
+
+
+async def run_load_test(
+    url: str,
+    duration: float,
+    concurrency: int,
+    mix: Dict[str, int],
+    seed: int = 42,
+    think_time: float = 0.0,
+    idle_duration: float = 5.0,
+    load_only_duration: float = 10.0,
+    ready_timeout: float = 120.0,
+    server: Optional[subprocess.Popen] = None
+) -> dict:
+    """
+    Measure the server idle, under load without reclusters, then under the full mix.
+
+    The load-only window is skipped when the mix has no reclusters, since
+    the full mix then measures the same thing.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    await wait_until_ready(host, port, ready_timeout, server)
+
+    rng = random.Random(seed)
+    started_at = datetime.now(timezone.utc).isoformat()
+    lag_ms = {}
+    mark = (await loop_lag(host, port))['now']
+
+    if idle_duration > 0:
+        await asyncio.sleep(idle_duration)
+        lag = await loop_lag(host, port, mark)
+        lag_ms['idle'], mark = lag['all'], lag['now']
+
+    load_only = None
+    load_only_mix = {name: weight for name, weight in mix.items() if name != 'cluster'}
+    if load_only_duration > 0 and 'cluster' in mix and load_only_mix:
+        load_state, elapsed = await run_clients(
+            host, port, load_only_mix, load_only_duration, concurrency, rng, think_time
+        )
+        load_only = summarize_samples(load_state.samples, elapsed)
+        lag = await loop_lag(host, port, mark)
+        lag_ms['load_only'], mark = lag['all'], lag['now']
+
+    state, elapsed = await run_clients(host, port, mix, duration, concurrency, rng, think_time)
+    lag = await loop_lag(host, port, mark)
+    lag_ms['during_recluster'] = lag['during_recluster']
+    lag_ms['between_reclusters'] = lag['other']
+
+    config = {
+        'url': url,
+        'duration_s': duration,
+        'concurrency': concurrency,
+        'mix': mix,
+        'seed': seed,
+        'think_time_s': think_time,
+        'idle_duration_s': idle_duration,
+        'load_only_duration_s': load_only_duration,
+        'lag_interval_ms': lag['interval_ms'],
+    }
+    return build_report(config, state, started_at, elapsed, lag_ms, load_only)
+
+
+def launch_server(port: int, workers: int = 1) -> subprocess.Popen:
+    """
+    Start a local uvicorn instance of the API.
+
+    Cluster state persistence is disabled, so the server clusters from
+    scratch and load-test reclusters never overwrite the saved clustering.
+    """
+    command = [
+        sys.executable, '-m', 'uvicorn', 'backend.api.main:app',
+        '--host', '127.0.0.1', '--port', str(port),
+        '--workers', str(workers), '--log-level', 'warning',
+    ]
+    env = {**os.environ, 'CLUSTER_STATE_PATH': ''}
+    return subprocess.Popen(command, cwd=str(PROJECT_ROOT), env=env)
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse a mix such as 'papers=40,search=40,cluster=5'."""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown endpoint '{name}'. Choose from: {', '.join(ENDPOINTS)}"
+            )
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def compare_reports(baseline: dict, report: dict) -> List[str]:
+    """Describe throughput and latency changes relative to a baseline report."""
+    lines = []
+
+    def delta(old: Optional[float], new: Optional[float]) -> str:
+        if old in (None, 0) or new is None:
+            return f"{new}"
+        return f"{new} ({(new - old) / old * 100:+.1f}%)"
+
+    for name, stats in report['endpoints'].items():
+        old = baseline.get('endpoints', {}).get(name)
+        if not old:
+            continue
+        lines.append(
+            f"{name:10s} rps {delta(old['throughput_rps'], stats['throughput_rps'])}"
+            f"  p50 {delta(old['latency_ms'].get('p50'), stats['latency_ms'].get('p50'))} ms"
+            f"  p95 {delta(old['latency_ms'].get('p95'), stats['latency_ms'].get('p95'))} ms"
+        )
+    for phase, new_lag in report['event_loop_lag_ms'].items():
+        old_lag = baseline.get('event_loop_lag_ms', {}).get(phase, {})
+        lines.append(f"loop lag {phase} p95 {delta(old_lag.get('p95'), new_lag.get('p95'))} ms")
+    return lines
+
+
+def print_report(report: dict):
+    """Print a human-readable summary of a report."""
+    totals = report['totals']
+    print(f"{totals['requests']} requests, {totals['errors']} errors, "
+          f"{totals['throughput_rps']} req/s over {report['duration_s']}s")
+    for name, stats in report['endpoints'].items():
+        latency = stats['latency_ms']
+        print(f"  {name:10s} {stats['requests']:6d} req  {stats['throughput_rps']:8.2f} req/s  "
+              f"p50 {latency.get('p50')} ms  p95 {latency.get('p95')} ms  p99 {latency.get('p99')} ms")
+    load_only = report.get('load_only')
+    if load_only:
+        latency = load_only['latency_ms']
+        print(f"  load only  {load_only['requests']:6d} req  {load_only['throughput_rps']:8.2f} req/s  "
+              f"p50 {latency.get('p50')} ms  p95 {latency.get('p95')} ms  p99 {latency.get('p99')} ms")
+    for phase, lag in report['event_loop_lag_ms'].items():
+        print(f"  loop lag ({phase}): p50 {lag.get('p50')} ms  p95 {lag.get('p95')} ms  "
+              f"max {lag.get('max')} ms  ({lag['count']} samples)")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load test the Digital Library Visualization API")
+    parser.add_argument('--url', help="Target a running server instead of launching one")
+    parser.add_argument('--port', type=int, default=8765, help="Port for the launched server")
+    parser.add_argument('--workers', type=int, default=1, help="Uvicorn workers for the launched server")
+    parser.add_argument('--duration', type=float, default=30.0, help="Test duration in seconds")
+    parser.add_argument('--concurrency', type=int, default=20, help="Number of concurrent clients")
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help="Weighted request mix, e.g. papers=40,search=40,stats=15,cluster=5")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Mean pause between requests per client")
+    parser.add_argument('--idle-duration', type=float, default=5.0,
+                        help="Seconds of measuring the idle server before the load starts")
+    parser.add_argument('--load-only-duration', type=float, default=10.0,
+                        help="Seconds of load without reclusters before the full mix")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for the request sequence")
+    parser.add_argument('--output', help="Write the JSON report to this path")
+    parser.add_argument('--baseline', help="Compare against a previous JSON report")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = launch_server(args.port, args.workers)
+        url = f"http://127.0.0.1:{args.port}"
+    try:
+        report = asyncio.run(run_load_test(
+            url,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            mix=args.mix,
+            seed=args.seed,
+            think_time=args.think_time,
+            idle_duration=args.idle_duration,
+            load_only_duration=args.load_only_duration,
+            server=server,
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_report(report)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            for line in compare_reports(json.load(f), report):
+                print(f"  {line}")
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
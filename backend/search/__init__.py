@@ -0,0 +1,2 @@
+# Search and ranking module
+
@@ -0,0 +1,176 @@
+"""
+Citation- and recency-aware ranking of search results.
+
+Text relevance is a BM25F-style score over title, keywords and abstract.
+It is blended with citation and recency priors that are precomputed once
+per corpus as NumPy vectors, so a query only touches the postings of its
+own terms plus a single partial sort over the hits.
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import numpy as np
+from backend.models.paper import Paper
+
+
+# Unicode word characters, so accented and non-Latin terms stay whole
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Relative importance of each field in the BM25F pseudo term frequency
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'keywords': 2.0,
+    'abstract': 1.0,
+}
+
+DEFAULT_WEIGHTS = {
+    'text': 1.0,
+    'citations': 0.3,
+    'recency': 0.1,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalise and casefold text, then split it into word tokens."""
+    return TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text).casefold())
+
+
+class PaperRanker:
+    """BM25F text relevance combined with citation and recency priors."""
+
+    def __init__(self, papers: List[Paper], k1: float = 1.2, b: float = 0.75):
+        self.papers = papers
+        self.k1 = k1
+        self.b = b
+        self._build_index()
+        self._build_priors()
+
+    def _field_tokens(self, paper: Paper) -> Dict[str, List[str]]:
+        """Tokenize each ranked field of a paper."""
+        return {
+            'title': tokenize(paper.title),
+            'keywords': tokenize(' '.join(paper.keywords)),
+            'abstract': tokenize(paper.abstract),
+        }
+
+    def _build_index(self):
+        """Build the inverted index with BM25F-saturated term weights."""
+        tokenized = [self._field_tokens(paper) for paper in self.papers]
+        n_docs = len(tokenized)
+
+        # Average field lengths for length normalisation
+        avg_lengths = {}
+        for field in FIELD_WEIGHTS:
+            lengths = [len(doc[field]) for doc in tokenized]
+            avg_lengths[field] = (sum(lengths) / n_docs) if n_docs and sum(lengths) else 1.0
+
+        postings = defaultdict(lambda: ([], []))
+        for doc_idx, doc in enumerate(tokenized):
+            # Weighted, length-normalised term frequency summed across fields
+            pseudo_tf = defaultdict(float)
+            for field, weight in FIELD_WEIGHTS.items():
+                tokens = doc[field]
+                if not tokens:
+                    continue
+                norm = 1 - self.b + self.b * len(tokens) / avg_lengths[field]
+                for token in tokens:
+                    pseudo_tf[token] += weight / norm
+            for token, tf in pseudo_tf.items():
+                doc_ids, tfs = postings[token]
+                doc_ids.append(doc_idx)
+                tfs.append(tf)
+
+        # Sorted vocabulary allows prefix lookups with a binary search
+        self.vocabulary = sorted(postings)
+        self.term_ids = {term: idx for idx, term in enumerate(self.vocabulary)}
+        self.postings: List[Tuple[np.ndarray, np.ndarray]] = []
+        for term in self.vocabulary:
+            doc_ids, tfs = postings[term]
+            doc_ids = np.asarray(doc_ids, dtype=np.int64)
+            tfs = np.asarray(tfs, dtype=np.float64)
+            df = len(doc_ids)
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            weights = idf * tfs / (self.k1 + tfs)
+            self.postings.append((doc_ids, weights))
+
+    def _build_priors(self):
+        """Precompute citation and recency priors scaled to [0, 1]."""
+        citations = np.array([paper.citations for paper in self.papers], dtype=np.float64)
+        years = np.array([paper.year for paper in self.papers], dtype=np.float64)
+
+        log_citations = np.log1p(np.clip(citations, 0, None))
+        max_log = log_citations.max() if len(log_citations) else 0.0
+        self.citation_prior = log_citations / max_log if max_log > 0 else np.zeros_like(log_citations)
+
+        if len(years) and years.max() > years.min():
+            self.recency_prior = (years - years.min()) / (years.max() - years.min())
+        else:
+            self.recency_prior = np.zeros_like(years)
+
+    def _query_term_ids(self, query: str) -> List[int]:
+        """Map query tokens to term ids; the last token also matches as a prefix."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        term_ids = {self.term_ids[token] for token in tokens[:-1] if token in self.term_ids}
+        # Treat the final token as a prefix so partially typed words still match
+        last = tokens[-1]
+        start = bisect_left(self.vocabulary, last)
+        end = bisect_left(self.vocabulary, last + '\uffff')
+        term_ids.update(range(start, end))
+        return sorted(term_ids)
+
+    def text_scores(self, query: str) -> np.ndarray:
+        """Compute BM25F text relevance for every paper in the corpus."""
+        scores = np.zeros(len(self.papers), dtype=np.float64)
+        for term_id in self._query_term_ids(query):
+            doc_ids, weights = self.postings[term_id]
+            scores[doc_ids] += weights
+        return scores
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        weights: Dict[str, float] = None
+    ) -> Tuple[List[Tuple[Paper, float]], int]:
+        """
+        Rank papers matching a query.
+
+        Args:
+            query: Free-text search query
+            limit: Maximum number of results to return
+            weights: Optional overrides for the 'text', 'citations' and
+                'recency' components of the combined score
+
+        Returns:
+            Tuple of (top papers with their scores, total number of hits)
+        """
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+        text = self.text_scores(query)
+        hits = np.flatnonzero(text > 0)
+        if len(hits) == 0:
+            return [], 0
+
+        # Normalise text relevance so weights are comparable with the priors
+        hit_text = text[hits] / text[hits].max()
+        combined = (
+            weights['text'] * hit_text
+            + weights['citations'] * self.citation_prior[hits]
+            + weights['recency'] * self.recency_prior[hits]
+        )
+
+        # Partial sort: only the top `limit` hits are fully ordered
+        k = min(limit, len(hits))
+        if k < len(hits):
+            top = np.argpartition(-combined, k - 1)[:k]
+        else:
+            top = np.arange(len(hits))
+        # Break ties by corpus order so results are deterministic
+        order = top[np.lexsort((hits[top], -combined[top]))]
+
+        results = [(self.papers[hits[idx]], float(combined[idx])) for idx in order]
+        return results, len(hits)
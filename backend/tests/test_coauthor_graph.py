@@ -0,0 +1,67 @@
+"""
+Tests for the incrementally maintained co-authorship graph.
+"""
+import random
+from backend.models.paper import Paper
+from backend.graph.coauthor_graph import CoauthorGraph
+
+
+FIRST_NAMES = ["Ana", "Björn", "Chen", "Dana", "Émile", "Farah", "Goran", "Hiro"]
+LAST_NAMES = ["Müller", "Smith", "Smithers", "Tanaka", "Okafor", "Novak"]
+
+
+def make_papers(n_papers=300, seed=7):
+    """Random papers over a pool of authors, so components grow and merge."""
+    rng = random.Random(seed)
+    pool = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    return [
+        Paper(
+            id=f"p{idx}",
+            title="Title",
+            authors=rng.sample(pool, rng.randint(1, 4)),
+            abstract="Abstract",
+            keywords=[],
+            year=2020,
+            venue="CHI",
+            citations=rng.randint(0, 50),
+        )
+        for idx in range(n_papers)
+    ]
+
+
+def snapshot(graph):
+    """Everything the graph exposes through its queries."""
+    return {
+        'authors': graph.authors(limit=1000),
+        'filtered': [graph.authors(query=q, limit=1000) for q in ("smi", "müller", "dana sm", "x")],
+        'components': graph.components(member_limit=1000),
+        'capped': graph.components(limit=3, member_limit=2),
+        'num_components': graph.num_components,
+        'collaborators': [graph.collaborators(a) for a in range(graph.num_authors)],
+        'profiles': [graph.profile(a) for a in range(graph.num_authors)],
+    }
+
+
+def test_incremental_graph_matches_rebuild():
+    papers = make_papers()
+    graph = CoauthorGraph(papers[:20])
+    # Build the CSR, rankings and member caches so later adds must patch them
+    snapshot(graph)
+    for idx, paper in enumerate(papers[20:], start=20):
+        graph.add_paper(paper)
+        if idx % 25 == 0:
+            assert snapshot(graph) == snapshot(CoauthorGraph(papers[:idx + 1]))
+
+    assert snapshot(graph) == snapshot(CoauthorGraph(papers))
+
+
+def test_name_filter_matches_word_prefixes():
+    graph = CoauthorGraph(make_papers())
+
+    names = {author['name'] for author in graph.authors(query="smith", limit=1000)}
+
+    assert names == {n for n in graph.author_names if n.split()[-1].startswith("Smith")}
+    assert all(
+        author['name'].startswith("Émile")
+        for author in graph.authors(query="émi", limit=1000)
+    )
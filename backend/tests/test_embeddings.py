@@ -0,0 +1,81 @@
+"""
+Tests for embedding encoders and the embedding cache.
+"""
+import os
+import numpy as np
+from backend.models.paper import Paper
+from backend.embeddings.cache import EmbeddingCache
+from backend.embeddings.encoders import (
+    BaseEncoder, HashingSVDEncoder, SentenceTransformerEncoder, encoder_from_env
+)
+
+
+TEXTS = [f"paper {i} about topic {i % 4} and retrieval model {i % 3}" for i in range(30)]
+
+
+class ModelEncoder(BaseEncoder):
+    """Encoder whose model, like a local transformer, is not pickled."""
+
+    def __init__(self):
+        self.model = None
+
+    def prepare(self, texts):
+        if self.model is None:
+            self.model = os.getpid()
+
+    def encode(self, texts):
+        if self.model is None:
+            raise RuntimeError("Encoder was not prepared in this process")
+        return np.ones((len(texts), 2), dtype=np.float32)
+
+    def fingerprint(self):
+        return "model"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['model'] = None
+        return state
+
+
+def make_papers(n):
+    return [
+        Paper(id=f"p{i}", title=TEXTS[i % len(TEXTS)], authors=["Author"], abstract="", keywords=[],
+              year=2020, venue="CHI")
+        for i in range(n)
+    ]
+
+
+def test_saved_basis_with_other_parameters_is_refitted(tmp_path):
+    model_path = str(tmp_path / "basis.npz")
+    HashingSVDEncoder(n_components=8, n_features=2 ** 10, model_path=model_path).prepare(TEXTS)
+
+    encoder = HashingSVDEncoder(n_components=8, n_features=2 ** 11, model_path=model_path)
+    encoder.prepare(TEXTS)
+
+    assert encoder.components.shape == (8, 2 * 2 ** 11)
+    assert encoder.encode(TEXTS[:2]).shape == (2, 8)
+    # The refitted basis replaces the stale one on disk
+    reloaded = HashingSVDEncoder(n_components=8, n_features=2 ** 11, model_path=model_path)
+    reloaded.prepare(TEXTS)
+    assert np.array_equal(reloaded.components, encoder.components)
+
+
+def test_process_workers_get_a_prepared_encoder(tmp_path):
+    encoder = ModelEncoder()
+    encoder.prepare([])
+    cache = EmbeddingCache(directory=str(tmp_path), batch_size=4, max_workers=2, use_processes=True)
+
+    embeddings = cache.get_embeddings(make_papers(10), encoder)
+
+    assert embeddings.shape == (10, 2)
+
+
+def test_encoder_selected_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv('EMBEDDING_ENCODER', raising=False)
+    assert isinstance(encoder_from_env(str(tmp_path)), HashingSVDEncoder)
+
+    monkeypatch.setenv('EMBEDDING_ENCODER', 'sentence-transformer')
+    monkeypatch.setenv('EMBEDDING_MODEL', 'all-mpnet-base-v2')
+    encoder = encoder_from_env(str(tmp_path))
+    assert isinstance(encoder, SentenceTransformerEncoder)
+    assert encoder.model_name == 'all-mpnet-base-v2'
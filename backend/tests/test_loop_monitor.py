@@ -0,0 +1,33 @@
+"""
+Tests for the server-side event-loop lag monitor.
+"""
+import asyncio
+import time
+from backend.api.loop_monitor import LoopLagMonitor
+
+
+def test_blocking_work_is_attributed_to_reclusters():
+    busy = {"recluster": False}
+
+    async def scenario():
+        monitor = LoopLagMonitor(interval=0.005, busy=lambda: busy["recluster"])
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        mark = monitor.summary()["now"]
+        busy["recluster"] = True
+        for _ in range(3):
+            # Block the loop the way CPU work holding the GIL would
+            time.sleep(0.05)
+            await asyncio.sleep(0)
+        busy["recluster"] = False
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return monitor.summary(mark)
+
+    summary = asyncio.run(scenario())
+
+    assert summary["during_recluster"]["count"] >= 1
+    assert summary["during_recluster"]["max"] >= 40
+    assert summary["other"]["count"] >= 1
+    assert summary["other"]["p50"] < 40
+    assert summary["all"]["count"] == summary["during_recluster"]["count"] + summary["other"]["count"]
@@ -0,0 +1,64 @@
+"""
+Tests for cluster id alignment across runs.
+"""
+from backend.models.paper import Paper
+from backend.analytics.quality import align_clusters
+
+
+def make_run(labels):
+    """Papers and cluster metadata for a run with the given labels."""
+    n_clusters = max(labels) + 1
+    clusters = [
+        {'id': i, 'name': f"Cluster {i + 1}: word{i}", 'top_words': [f"word{i}"], 'size': labels.count(i)}
+        for i in range(n_clusters)
+    ]
+    papers = [
+        Paper(
+            id=f"p{idx}",
+            title="Title",
+            authors=["Author"],
+            abstract="Abstract",
+            keywords=[],
+            year=2020,
+            venue="CHI",
+            citations=0,
+            cluster_id=label,
+            cluster_name=clusters[label]['name'],
+        )
+        for idx, label in enumerate(labels)
+    ]
+    return papers, clusters
+
+
+def assert_consistent(papers, clusters):
+    """Ids are 0..k-1 and every name carries its cluster's number."""
+    assert [cluster['id'] for cluster in clusters] == list(range(len(clusters)))
+    names = {cluster['id']: cluster['name'] for cluster in clusters}
+    for cluster in clusters:
+        assert cluster['name'].startswith(f"Cluster {cluster['id'] + 1}:")
+    for paper in papers:
+        assert paper.cluster_name == names[paper.cluster_id]
+
+
+def test_ids_follow_previous_run():
+    previous = {f"p{idx}": label for idx, label in enumerate([0, 0, 1, 1, 2, 2])}
+    papers, clusters = make_run([2, 2, 0, 0, 1, 1])
+
+    ari = align_clusters(papers, clusters, previous)
+
+    assert ari == 1.0
+    assert [paper.cluster_id for paper in papers] == [0, 0, 1, 1, 2, 2]
+    # Top words travel with the cluster, the name number follows the id
+    assert clusters[0]['name'] == "Cluster 1: word2"
+    assert_consistent(papers, clusters)
+
+
+def test_ids_stay_consecutive_with_fewer_clusters():
+    previous = {f"p{idx}": label for idx, label in enumerate([0, 0, 1, 1, 2, 2, 3, 3, 4, 4])}
+    # The new run keeps old clusters 0 and 4 and merges the rest
+    papers, clusters = make_run([0, 0, 2, 2, 2, 2, 2, 2, 1, 1])
+
+    align_clusters(papers, clusters, previous)
+
+    assert_consistent(papers, clusters)
+    assert papers[0].cluster_id == 0
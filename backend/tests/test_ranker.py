@@ -0,0 +1,38 @@
+"""
+Tests for search tokenization and ranking.
+"""
+from backend.models.paper import Paper
+from backend.search.ranker import PaperRanker, tokenize
+
+
+def make_paper(paper_id, title, keywords=()):
+    return Paper(
+        id=paper_id,
+        title=title,
+        authors=["Author"],
+        abstract="Abstract",
+        keywords=list(keywords),
+        year=2020,
+        venue="CHI",
+    )
+
+
+def test_tokenize_keeps_non_ascii_words():
+    assert tokenize("Müller café") == ["müller", "café"]
+    # Decomposed accents and case variants map to the same token
+    assert tokenize("Cafe\u0301 STRASSE") == tokenize("café straße")
+
+
+def test_search_matches_accented_terms():
+    ranker = PaperRanker([
+        make_paper("a", "Café recommendation study"),
+        make_paper("b", "Caffeine and productivity", keywords=["Müller-Lyer illusion"]),
+        make_paper("c", "Cafeteria layouts"),
+    ])
+
+    results, total = ranker.search("café")
+    assert total == 1
+    assert results[0][0].id == "a"
+
+    results, total = ranker.search("müller")
+    assert [paper.id for paper, _ in results] == ["b"]
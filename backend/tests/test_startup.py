@@ -0,0 +1,71 @@
+"""
+Tests for background startup of the API.
+"""
+import time
+import pytest
+from fastapi.testclient import TestClient
+import backend.api.main as main
+
+
+@pytest.fixture
+def fresh_api(monkeypatch):
+    """Reset the API globals and disable cluster state persistence."""
+    monkeypatch.setattr(main, "CLUSTER_STATE_PATH", "")
+    monkeypatch.setattr(main, "clusters", [])
+    monkeypatch.setattr(main, "current_method", "kmeans")
+    monkeypatch.setattr(main, "ranker", None)
+    monkeypatch.setattr(main, "trend_cube", None)
+    monkeypatch.setattr(main, "quality_report", None)
+    monkeypatch.setattr(main, "status", {"state": "starting", "error": None})
+    return monkeypatch
+
+
+def wait_for_state(client, states, timeout=60.0):
+    """Poll /api/ready until the state is one of `states`."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        state = client.get("/api/ready").json()["state"]
+        if state in states:
+            return state
+        time.sleep(0.05)
+    raise TimeoutError(f"API did not reach {states}")
+
+
+def test_recluster_during_indexing_is_kept(fresh_api):
+    ranker_class = main.PaperRanker
+
+    def slow_ranker(papers):
+        time.sleep(1.0)
+        return ranker_class(papers)
+
+    fresh_api.setattr(main, "PaperRanker", slow_ranker)
+    with TestClient(main.app) as client:
+        assert client.get("/api/ready").json()["state"] == "indexing"
+        response = client.post("/api/cluster/hierarchical?n_clusters=8")
+        assert response.status_code == 200
+
+        assert wait_for_state(client, {"ready", "failed"}) == "ready"
+        stats = client.get("/api/stats").json()
+        assert stats["current_method"] == "hierarchical"
+        assert stats["total_clusters"] == 8
+
+
+def test_recluster_recovers_from_failed_startup(fresh_api):
+    get_clusterer = main.get_clusterer
+    calls = []
+
+    def failing_once(method):
+        calls.append(method)
+        if len(calls) == 1:
+            raise RuntimeError("startup clustering failed")
+        return get_clusterer(method)
+
+    fresh_api.setattr(main, "get_clusterer", failing_once)
+    with TestClient(main.app) as client:
+        assert wait_for_state(client, {"ready", "failed"}) == "failed"
+        assert client.get("/api/ready").status_code == 503
+
+        assert client.post("/api/cluster/kmeans?n_clusters=4").status_code == 200
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        assert response.json()["error"] is None
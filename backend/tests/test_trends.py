@@ -0,0 +1,62 @@
+"""
+Tests for the topic trend cube.
+"""
+from backend.models.paper import Paper
+from backend.analytics.trends import TrendCube
+
+
+def make_papers():
+    """Cluster 0 is steady, cluster 1 grows sharply in the last two years."""
+    papers = []
+    counts = {
+        2018: (5, 1), 2019: (5, 1), 2020: (5, 1), 2021: (5, 1),
+        2022: (5, 6), 2023: (5, 8),
+    }
+    for year, per_cluster in counts.items():
+        for cluster_id, n in enumerate(per_cluster):
+            for i in range(n):
+                papers.append(Paper(
+                    id=f"{year}-{cluster_id}-{i}",
+                    title="Title",
+                    authors=["Author"],
+                    abstract="Abstract",
+                    keywords=[],
+                    year=year,
+                    venue="SIGIR" if i % 2 else "CHI",
+                    citations=i,
+                    cluster_id=cluster_id,
+                    cluster_name=f"Cluster {cluster_id + 1}",
+                ))
+    return papers
+
+
+CLUSTERS = [
+    {'id': 0, 'name': 'Cluster 1', 'top_words': []},
+    {'id': 1, 'name': 'Cluster 2', 'top_words': []},
+]
+
+
+def test_filtered_growth_matches_unfiltered():
+    cube = TrendCube(make_papers(), CLUSTERS)
+    unfiltered = {c['id']: c for c in cube.query()['clusters']}
+
+    for cluster_id, expected in unfiltered.items():
+        filtered = cube.query(cluster_id=cluster_id)['clusters']
+        assert len(filtered) == 1
+        assert filtered[0]['growth_rate'] == expected['growth_rate']
+        assert filtered[0]['emerging'] == expected['emerging']
+        assert filtered[0]['counts'] == expected['counts']
+
+    assert unfiltered[1]['emerging']
+    assert unfiltered[1]['growth_rate'] > 0
+    assert unfiltered[0]['growth_rate'] < 0
+
+
+def test_filtered_growth_matches_unfiltered_within_venue():
+    cube = TrendCube(make_papers(), CLUSTERS)
+    unfiltered = {c['id']: c for c in cube.query(venue='CHI')['clusters']}
+
+    for cluster_id, expected in unfiltered.items():
+        filtered = cube.query(cluster_id=cluster_id, venue='CHI')['clusters'][0]
+        assert filtered['growth_rate'] == expected['growth_rate']
+        assert filtered['emerging'] == expected['emerging']
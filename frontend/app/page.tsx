@@ -106,9 +106,10 @@ export default function Home() {
     setSelectedCluster(clusterId);
   };
 
-  const clustersWithColors = clusters.map((cluster, index) => ({
+  // Color by id, which the backend keeps stable across re-clustering
+  const clustersWithColors = clusters.map((cluster) => ({
     ...cluster,
-    color: CLUSTER_COLORS[index % CLUSTER_COLORS.length],
+    color: CLUSTER_COLORS[cluster.id % CLUSTER_COLORS.length],
   }));
 
   if (isLoading) {
@@ -178,6 +179,7 @@ export default function Home() {
                     <option value="kmeans">K-means</option>
                     <option value="lda">LDA</option>
                     <option value="hierarchical">Hierarchical</option>
+                    <option value="embedding">Embedding</option>
                   </select>
                 </div>
                 <div>
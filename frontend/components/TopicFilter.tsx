@@ -30,7 +30,7 @@ export default function TopicFilter({
         >
           All Topics
         </button>
-        {clusters.map((cluster, index) => (
+        {clusters.map((cluster) => (
           <button
             key={cluster.id}
             onClick={() => onClusterSelect(cluster.id)}
@@ -42,7 +42,7 @@ export default function TopicFilter({
           >
             <div
               className="w-4 h-4 rounded-full flex-shrink-0"
-              style={{ backgroundColor: colors[index % colors.length] }}
+              style={{ backgroundColor: colors[cluster.id % colors.length] }}
             />
             <div className="flex-1 min-w-0">
               <div className="font-medium truncate">{cluster.name}</div>
@@ -44,5 +44,5 @@ export interface Stats {
   venues: number;
 }
 
-export type ClusteringMethod = 'lda' | 'kmeans' | 'hierarchical';
+export type ClusteringMethod = 'lda' | 'kmeans' | 'hierarchical' | 'embedding';
 